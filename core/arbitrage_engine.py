@@ -1,9 +1,12 @@
 import time
+from array import array
+from collections import deque
+from itertools import islice
 from utils.logger import setup_logger
 import threading
 from typing import Dict, List, Optional, Tuple, Callable
 from config.config_manager import ConfigManager
-from models.arbitrage_path import ArbitragePath, ArbitrageOpportunity
+from models.arbitrage_path import ArbitragePath, ArbitrageOpportunity, ArbitrageAnalysis
 
 
 class ArbitrageEngine:
@@ -49,6 +52,7 @@ class ArbitrageEngine:
         self.is_monitoring = False
         self.monitor_thread = None
         self.opportunity_callbacks = []
+        self.analysis_callbacks = []
         
         # 统计数据
         self.stats = {
@@ -59,8 +63,15 @@ class ArbitrageEngine:
             'start_time': time.time()
         }
         
-        # 存储所有分析结果（包括非盈利的）
-        self.recent_analyses = []
+        # 存储所有分析结果（包括非盈利的），最新的在最前，保持最近200条记录
+        self.recent_analyses: deque = deque(maxlen=200)
+        
+        # 分析结果的列存储（SoA，与 recent_analyses 同序同长度），供监控界面按列读取和哈希
+        self.analysis_paths: deque = deque(maxlen=200)
+        self.analysis_profit_rates: deque = deque(maxlen=200)
+        self.analysis_timestamps: deque = deque(maxlen=200)
+        # 引擎线程写入、监控线程读取：四个队列在同一把锁下追加和读取，保证各列等长且逐行对齐
+        self.analysis_lock = threading.Lock()
         
         self.logger.info("套利引擎初始化完成")
         self.logger.info(f"默认手续费率: {self.fee_rate}")
@@ -162,17 +173,15 @@ class ArbitrageEngine:
         
         # 存储分析结果（无论是否盈利）
         path_name = ' -> '.join(path)
-        analysis_result = {
-            'path_name': path_name,
-            'profit_rate': profit_rate,
-            'timestamp': time.time(),
-            'is_profitable': profit_rate > self.min_profit_threshold,
-            'final_amount': final_amount,
-            'initial_amount': self.min_trade_amount
-        }
-        self.recent_analyses.append(analysis_result)
-        # 保持最近200条记录
-        self.recent_analyses = self.recent_analyses[-200:]
+        analysis_result = ArbitrageAnalysis(
+            path_name=path_name,
+            profit_rate=profit_rate,
+            timestamp=time.time(),
+            is_profitable=profit_rate > self.min_profit_threshold,
+            final_amount=final_amount,
+            initial_amount=self.min_trade_amount
+        )
+        self._record_analysis(analysis_result)
         
         # 多重验证机制
         validation_result = self._validate_arbitrage_opportunity(final_amount, profit_rate, trade_steps)
@@ -281,12 +290,7 @@ class ArbitrageEngine:
         self.stats['last_check_time'] = time.time()
         
         # 预先获取并验证所有需要的订单簿数据
-        required_pairs = set()
-        for path_name, path_config in self.paths.items():
-            if isinstance(path_config, dict) and 'steps' in path_config:
-                for step in path_config['steps']:
-                    if 'pair' in step:
-                        required_pairs.add(step['pair'])
+        required_pairs = self._get_required_pairs()
         
         # 获取所有必需的订单簿数据（使用高精度方法，如果失败则回退到常规方法）
         orderbooks = {}
@@ -296,12 +300,12 @@ class ArbitrageEngine:
                 # 回退到常规订单簿，至少用于监控显示
                 orderbook = self.data_collector.get_orderbook(pair)
                 if orderbook:
-                    self.logger.debug(f"使用常规订单簿数据 {pair} (可能不够新鲜用于实际交易)")
+                    self.logger.debug("使用常规订单簿数据 %s (可能不够新鲜用于实际交易)", pair)
             
             if orderbook:
                 orderbooks[pair] = orderbook
             else:
-                self.logger.debug(f"无法获取 {pair} 的任何订单簿数据，跳过此轮套利检查")
+                self.logger.debug("无法获取 %s 的任何订单簿数据，跳过此轮套利检查", pair)
                 return opportunities
         
         # 数据一致性检查（自动交易模式下强制启用）
@@ -310,6 +314,10 @@ class ArbitrageEngine:
                 self.logger.warning("数据时间一致性检查失败，跳过此轮套利检查（strict模式）")
                 return opportunities
         
+        # 同一有序路径可能以不同名称重复配置：以ArbitragePath为键去重，保留利润率更高者
+        # （同一环路的不同起点需要不同的起始资金，不视为重复）
+        seen_paths = {}
+        
         # 检查所有配置的路径
         for path_name, path_config in self.paths.items():
             if not path_config:
@@ -318,7 +326,7 @@ class ArbitrageEngine:
             # 优先使用新的JSON格式配置
             if isinstance(path_config, dict) and 'steps' in path_config:
                 # 新的JSON格式，直接使用配置的交易对，传递已验证的订单簿数据
-                self.logger.debug(f"使用显式配置分析路径 {path_name}")
+                self.logger.debug("使用显式配置分析路径 %s", path_name)
                 opportunity = self.calculate_arbitrage_from_steps(path_name, path_config, orderbooks)
             else:
                 # 对于旧格式，建议用户升级到新格式
@@ -328,13 +336,21 @@ class ArbitrageEngine:
                 if not path_assets:
                     continue
                     
-                self.logger.debug(f"分析路径 {path_name}: {' -> '.join(path_assets)} (使用推断模式)")
+                self.logger.debug("分析路径 %s: %s (使用推断模式)", path_name, ' -> '.join(path_assets))
                 opportunity = self.calculate_arbitrage(path_assets)
             
             if opportunity:
+                arbitrage_path = opportunity.path
+                if not isinstance(arbitrage_path, ArbitragePath):
+                    arbitrage_path = ArbitragePath(arbitrage_path)
+                seen_index = seen_paths.get(arbitrage_path)
+                if seen_index is not None and opportunities[seen_index]['profit_rate'] >= opportunity.profit_rate:
+                    self.logger.debug("路径 %s 与已发现的路径重复，跳过", path_name)
+                    continue
+                
                 opportunity_dict = {
                     'path_name': path_name,
-                    'path': opportunity.path.path if hasattr(opportunity.path, 'path') else opportunity.path,
+                    'path': list(arbitrage_path.path),
                     'profit_rate': opportunity.profit_rate,
                     'min_trade_amount': opportunity.min_trade_amount,
                     'max_trade_amount': opportunity.max_trade_amount,
@@ -342,16 +358,51 @@ class ArbitrageEngine:
                     'timestamp': opportunity.timestamp,
                     'trade_steps': _sanitize_trade_steps(opportunity.trade_steps)
                 }
+                if seen_index is not None:
+                    opportunities[seen_index] = opportunity_dict
+                    self.logger.debug("路径 %s 替换利润率更低的重复路径", path_name)
+                    continue
+                seen_paths[arbitrage_path] = len(opportunities)
                 opportunities.append(opportunity_dict)
                 
                 # 更新统计
                 self.stats['opportunity_count'] += 1
                 self.stats['total_profit_rate'] += opportunity.profit_rate
                 
-                self.logger.info(f"发现套利机会: {path_name}, 利润率: {opportunity.profit_rate:.4%}")
+                self.logger.info("发现套利机会: %s, 利润率: %.4f%%", path_name, opportunity.profit_rate * 100)
         
         return opportunities
     
+    def _get_required_pairs(self) -> Tuple[str, ...]:
+        """
+        获取所有配置路径需要的交易对
+        
+        Returns:
+            去重并排序后的交易对元组
+        """
+        required_pairs = set()
+        for path_config in self.paths.values():
+            if isinstance(path_config, dict) and 'steps' in path_config:
+                for step in path_config['steps']:
+                    if 'pair' in step:
+                        required_pairs.add(step['pair'])
+        return tuple(sorted(required_pairs))
+    
+    def snapshot_fingerprint(self) -> Tuple:
+        """
+        获取套利计算输入数据的指纹
+        
+        由各必需交易对缓存订单簿的时间戳组成；指纹不变说明订单簿没有更新，
+        调用方可复用上一次find_opportunities的结果。
+        
+        Returns:
+            (交易对, 订单簿时间戳) 元组，缺失的订单簿时间戳为None
+        """
+        cache = self.data_collector.orderbook_cache
+        with self.data_collector.cache_lock:
+            orderbooks = [(pair, cache.get(pair)) for pair in self._get_required_pairs()]
+        return tuple((pair, orderbook.timestamp if orderbook else None) for pair, orderbook in orderbooks)
+    
     def calculate_arbitrage_from_steps(self, path_name: str, path_config: dict, validated_orderbooks: Dict = None) -> Optional[ArbitrageOpportunity]:
         """
         直接使用配置文件中的交易步骤计算套利机会
@@ -427,17 +478,15 @@ class ArbitrageEngine:
             final_amount, profit_rate = self.calculate_path_profit_from_steps(trade_steps, self.min_trade_amount)
             
             # 存储分析结果（无论是否盈利）
-            analysis_result = {
-                'path_name': path_name,
-                'profit_rate': profit_rate,
-                'timestamp': time.time(),
-                'is_profitable': profit_rate > self.min_profit_threshold,
-                'final_amount': final_amount,
-                'initial_amount': self.min_trade_amount
-            }
-            self.recent_analyses.append(analysis_result)
-            # 保持最近200条记录
-            self.recent_analyses = self.recent_analyses[-200:]
+            analysis_result = ArbitrageAnalysis(
+                path_name=path_name,
+                profit_rate=profit_rate,
+                timestamp=time.time(),
+                is_profitable=profit_rate > self.min_profit_threshold,
+                final_amount=final_amount,
+                initial_amount=self.min_trade_amount
+            )
+            self._record_analysis(analysis_result)
             
             # 多重验证机制
             validation_result = self._validate_arbitrage_opportunity(final_amount, profit_rate, trade_steps)
@@ -614,6 +663,29 @@ class ArbitrageEngine:
         
         return current_amount, profit_rate
     
+    def _get_top_depth(self, order_book, side: str, levels: int = 5) -> Optional[float]:
+        """
+        获取订单簿一侧前N档的挂单数量之和
+        
+        OrderBook直接对缓存的NumPy深度数组求和，dict格式订单簿逐档求和
+        
+        Args:
+            order_book: OrderBook对象或{'bids': [...], 'asks': [...]}字典
+            side: 'asks'或'bids'
+            levels: 档位数量
+            
+        Returns:
+            挂单数量之和，该侧无挂单时返回None
+        """
+        if hasattr(order_book, 'get_ask_levels'):
+            depth = order_book.get_ask_levels() if side == 'asks' else order_book.get_bid_levels()
+            if not depth.shape[1]:
+                return None
+            return float(depth[1, :levels].sum())
+        if isinstance(order_book, dict) and order_book.get(side):
+            return sum(level[1] for level in order_book[side][:levels])
+        return None
+    
     def _calculate_max_trade_amount_from_steps(self, trade_steps: list) -> float:
         """基于交易步骤计算最大可交易量"""
         max_amount = float('inf')
@@ -623,22 +695,10 @@ class ArbitrageEngine:
             order_book = step['order_book']
             action = step['action']
             
-            if action == 'buy':
-                # 买入时，检查卖单深度
-                if hasattr(order_book, 'asks') and order_book.asks:
-                    available = sum(ask[1] for ask in order_book.asks[:5])  # 前5档
-                    max_amount = min(max_amount, available)
-                elif isinstance(order_book, dict) and order_book.get('asks'):
-                    available = sum(ask[1] for ask in order_book['asks'][:5])  # 前5档
-                    max_amount = min(max_amount, available)
-            else:  # sell
-                # 卖出时，检查买单深度
-                if hasattr(order_book, 'bids') and order_book.bids:
-                    available = sum(bid[1] for bid in order_book.bids[:5])  # 前5档
-                    max_amount = min(max_amount, available)
-                elif isinstance(order_book, dict) and order_book.get('bids'):
-                    available = sum(bid[1] for bid in order_book['bids'][:5])  # 前5档
-                    max_amount = min(max_amount, available)
+            # 买入时检查卖单深度，卖出时检查买单深度（前5档）
+            available = self._get_top_depth(order_book, 'asks' if action == 'buy' else 'bids')
+            if available is not None:
+                max_amount = min(max_amount, available)
         
         return min(max_amount, 10000.0)  # 限制最大交易量
     
@@ -808,22 +868,10 @@ class ArbitrageEngine:
             order_book = step['order_book']
             direction = step['direction']
             
-            if direction == 'buy':
-                # 买入时，检查卖单深度
-                if hasattr(order_book, 'asks') and order_book.asks:
-                    available = sum(ask[1] for ask in order_book.asks[:5])  # 前5档
-                    max_amount = min(max_amount, available)
-                elif isinstance(order_book, dict) and order_book.get('asks'):
-                    available = sum(ask[1] for ask in order_book['asks'][:5])  # 前5档
-                    max_amount = min(max_amount, available)
-            else:
-                # 卖出时，检查买单深度
-                if hasattr(order_book, 'bids') and order_book.bids:
-                    available = sum(bid[1] for bid in order_book.bids[:5])  # 前5档
-                    max_amount = min(max_amount, available)
-                elif isinstance(order_book, dict) and order_book.get('bids'):
-                    available = sum(bid[1] for bid in order_book['bids'][:5])  # 前5档
-                    max_amount = min(max_amount, available)
+            # 买入时检查卖单深度，卖出时检查买单深度（前5档）
+            available = self._get_top_depth(order_book, 'asks' if direction == 'buy' else 'bids')
+            if available is not None:
+                max_amount = min(max_amount, available)
         
         return min(max_amount, 10000.0)  # 限制最大交易量
     
@@ -884,6 +932,50 @@ class ArbitrageEngine:
         else:
             self.logger.error("尝试注册非可调用对象")
     
+    def register_analysis_callback(self, callback: Callable):
+        """注册分析结果回调函数（每记录一条分析结果时调用，不带参数）"""
+        if callable(callback):
+            self.analysis_callbacks.append(callback)
+            self.logger.info(f"已注册分析回调函数: {callback.__name__}")
+        else:
+            self.logger.error("尝试注册非可调用对象")
+    
+    def _record_analysis(self, analysis_result: ArbitrageAnalysis):
+        """
+        记录一条分析结果并通知分析回调
+        
+        Args:
+            analysis_result: 分析结果
+        """
+        # 新结果插入队首，deque 自动淘汰超出200条的旧记录
+        with self.analysis_lock:
+            self.recent_analyses.appendleft(analysis_result)
+            self.analysis_paths.appendleft(analysis_result.path_name)
+            self.analysis_profit_rates.appendleft(analysis_result.profit_rate)
+            self.analysis_timestamps.appendleft(analysis_result.timestamp)
+        for callback in self.analysis_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error(f"执行分析回调失败: {e}")
+    
+    def get_recent_analysis_columns(self, limit: int) -> Tuple[List[str], array, array]:
+        """
+        获取最近分析结果的列快照（最新的在最前）
+        
+        Args:
+            limit: 最多返回的条数
+            
+        Returns:
+            (路径名列表, 利润率数组, 时间戳数组)，数组为连续的 double 缓冲区
+        """
+        with self.analysis_lock:
+            return (
+                list(islice(self.analysis_paths, limit)),
+                array('d', islice(self.analysis_profit_rates, limit)),
+                array('d', islice(self.analysis_timestamps, limit)),
+            )
+    
     def get_statistics(self) -> Dict:
         """获取监控统计信息"""
         runtime = time.time() - self.stats['start_time']
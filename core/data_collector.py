@@ -5,10 +5,11 @@
 """
 
 import asyncio
+import math
 import time
 from utils.logger import setup_logger
 import threading
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from core.okx_client import OKXClient
 from core.websocket_manager import WebSocketManager
 from models.order_book import OrderBook
@@ -24,15 +25,22 @@ class DataCollector:
     - WebSocket用于实时市场数据（订单簿等）
     """
     
-    def __init__(self):
-        """初始化数据采集器"""
+    def __init__(self, ws_manager: Optional[WebSocketManager] = None):
+        """
+        初始化数据采集器
+        
+        Args:
+            ws_manager: 共用的WebSocket管理器，不传则自行创建；
+                        传入时连接由调用方管理，stop()不会断开它
+        """
         self.logger = setup_logger(__name__)
         
         # 初始化REST客户端
         self.rest_client = OKXClient()
         
         # 初始化WebSocket管理器
-        self.ws_manager = WebSocketManager()
+        self._owns_ws_manager = ws_manager is None
+        self.ws_manager = ws_manager if ws_manager is not None else WebSocketManager()
         
         # 余额更新回调（将在TradeExecutor中设置）
         self.balance_update_callback = None
@@ -46,10 +54,22 @@ class DataCollector:
         # 数据更新回调
         self.data_callbacks = []
         
+        # 回调合并：窗口期内每个交易对只保留最新订单簿，窗口结束后统一通知回调
+        self.callback_batch_interval = 0.02  # 20ms
+        self._pending_updates: Dict[str, Tuple[str, OrderBook]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        
         # 订单簿缓存
         self.orderbook_cache = {}
         self.cache_lock = threading.Lock()
         
+        # 最优价格快照（SoA并行列表，按交易对槽位索引，随订单簿更新写入）
+        self.price_pair_index: Dict[str, int] = {}
+        self.best_bids: List[float] = []
+        self.best_asks: List[float] = []
+        self.spread_pcts: List[float] = []
+        self.price_timestamps: List[float] = []
+        
         # 账户余额缓存
         self.balance_cache = None
         self.balance_last_updated = 0
@@ -133,8 +153,8 @@ class DataCollector:
                     'BTC-USDT', 'BTC-USDC', 'USDC-USDT'
                 ]
             
-            # 启动WebSocket连接
-            if not await self.ws_manager.connect():
+            # 启动WebSocket连接（共用的连接已建立时直接复用）
+            if not self.ws_manager.is_ws_connected() and not await self.ws_manager.connect():
                 self.logger.error("WebSocket连接失败")
                 return False
             
@@ -194,8 +214,14 @@ class DataCollector:
             
             self.logger.info("正在停止数据采集器...")
             
-            # 停止WebSocket连接
-            await self.ws_manager.disconnect()
+            # 停止WebSocket连接；共用的连接保持打开，只取消本采集器的订阅并摘除回调
+            if self._owns_ws_manager:
+                await self.ws_manager.disconnect()
+            else:
+                await self.ws_manager.unsubscribe_orderbooks(list(self.subscribed_pairs))
+                self.ws_manager.remove_data_callback(self._on_data_update)
+                if self.balance_update_callback and self.ws_manager.balance_update_callback == self.balance_update_callback:
+                    self.ws_manager.set_balance_update_callback(None)
             
             # 取消定期同步任务
             if self.sync_task:
@@ -212,6 +238,12 @@ class DataCollector:
                 self.stats_task.cancel()
                 self.stats_task = None
             
+            # 取消待发送的合并回调
+            if self._flush_task:
+                self._flush_task.cancel()
+                self._flush_task = None
+            self._pending_updates.clear()
+            
             # 清理状态
             self.subscribed_pairs.clear()
             self.data_callbacks.clear()
@@ -219,6 +251,11 @@ class DataCollector:
             # 清理缓存
             with self.cache_lock:
                 self.orderbook_cache.clear()
+                self.price_pair_index.clear()
+                self.best_bids.clear()
+                self.best_asks.clear()
+                self.spread_pcts.clear()
+                self.price_timestamps.clear()
             
             with self.balance_lock:
                 self.balance_cache = None
@@ -277,8 +314,7 @@ class DataCollector:
                         timestamp=timestamp
                     )
                     # 更新缓存
-                    with self.cache_lock:
-                        self.orderbook_cache[inst_id] = orderbook
+                    self._store_orderbook(inst_id, orderbook)
                     return orderbook
             
             # 如果WebSocket数据不可用，使用REST获取
@@ -294,8 +330,7 @@ class DataCollector:
             if rest_data and isinstance(rest_data, OrderBook):
                 orderbook = rest_data
                 # 更新缓存
-                with self.cache_lock:
-                    self.orderbook_cache[inst_id] = orderbook
+                self._store_orderbook(inst_id, orderbook)
                 return orderbook
             
             return None
@@ -344,6 +379,69 @@ class DataCollector:
             self._record_api_call('get_orderbook', time.time() - start_time, True)
             return None
     
+    def get_price_snapshot(self, inst_ids: List[str],
+                           max_age: Optional[float] = None) -> Tuple[List[float], List[float], List[float]]:
+        """
+        获取多个交易对的最优价格快照（只读缓存，不触发REST请求）
+        
+        Args:
+            inst_ids: 产品ID列表
+            max_age: 最大数据年龄（秒），超过则视为无数据；默认不限制，
+                     返回最近一次有效订单簿的价格（行情不活跃的交易对也能正常显示）
+            
+        Returns:
+            (最优买价列表, 最优卖价列表, 价差百分比列表)，与inst_ids一一对应，
+            无数据（或超过max_age）的交易对为NaN
+        """
+        nan = math.nan
+        cutoff = time.time() - max_age if max_age is not None else None
+        bids, asks, spreads = [], [], []
+        with self.cache_lock:
+            for inst_id in inst_ids:
+                idx = self.price_pair_index.get(inst_id)
+                if idx is None or (cutoff is not None and self.price_timestamps[idx] <= cutoff):
+                    bids.append(nan)
+                    asks.append(nan)
+                    spreads.append(nan)
+                else:
+                    bids.append(self.best_bids[idx])
+                    asks.append(self.best_asks[idx])
+                    spreads.append(self.spread_pcts[idx])
+        return bids, asks, spreads
+    
+    def _store_orderbook(self, inst_id: str, orderbook: OrderBook):
+        """
+        写入订单簿缓存，并同步更新最优价格快照
+        
+        Args:
+            inst_id: 产品ID
+            orderbook: 订单簿对象
+        """
+        best_bid = orderbook.bids[0][0] if orderbook.bids else None
+        best_ask = orderbook.asks[0][0] if orderbook.asks else None
+        
+        with self.cache_lock:
+            self.orderbook_cache[inst_id] = orderbook
+            
+            idx = self.price_pair_index.get(inst_id)
+            if idx is None:
+                idx = len(self.best_bids)
+                self.price_pair_index[inst_id] = idx
+                self.best_bids.append(math.nan)
+                self.best_asks.append(math.nan)
+                self.spread_pcts.append(math.nan)
+                self.price_timestamps.append(0.0)
+            
+            if best_bid is not None and best_ask is not None and best_ask > 0:
+                self.best_bids[idx] = best_bid
+                self.best_asks[idx] = best_ask
+                self.spread_pcts[idx] = (best_ask - best_bid) / best_ask * 100
+                self.price_timestamps[idx] = orderbook.timestamp
+            else:
+                self.best_bids[idx] = math.nan
+                self.best_asks[idx] = math.nan
+                self.spread_pcts[idx] = math.nan
+    
     def get_balance(self) -> Optional[Portfolio]:
         """
         获取账户余额（使用缓存）
@@ -387,6 +485,22 @@ class DataCollector:
             self._record_error()
             return None
     
+    async def get_balance_async(self) -> Optional[Portfolio]:
+        """
+        异步获取账户余额（使用缓存）
+        
+        缓存有效时直接返回，否则在线程中执行REST请求，不阻塞事件循环
+        
+        Returns:
+            投资组合数据或None
+        """
+        with self.balance_lock:
+            if (self.balance_cache and 
+                time.time() - self.balance_last_updated < self.balance_sync_interval):
+                return self.balance_cache
+        
+        return await asyncio.to_thread(self.get_balance)
+    
     def get_best_prices(self, inst_id: str) -> Optional[Dict[str, float]]:
         """
         获取最优买卖价格
@@ -478,13 +592,32 @@ class DataCollector:
             )
             
             # 更新缓存
-            with self.cache_lock:
-                self.orderbook_cache[inst_id] = orderbook
+            self._store_orderbook(inst_id, orderbook)
             
             # 记录订单簿更新
             self._record_orderbook_update()
             
-            # 通知所有回调函数
+            # 缓存已即时更新；回调通知合并到窗口期末，同一交易对只推送最新订单簿
+            if self.data_callbacks:
+                self._pending_updates[inst_id] = (action, orderbook)
+                if self._flush_task is None:
+                    self._flush_task = asyncio.create_task(self._flush_pending_updates())
+                    
+        except Exception as e:
+            self.logger.error(f"处理数据更新事件失败: {e}")
+            self._record_error()
+    
+    async def _flush_pending_updates(self):
+        """
+        等待合并窗口结束后，将各交易对的最新订单簿通知给所有回调函数
+        """
+        try:
+            await asyncio.sleep(self.callback_batch_interval)
+        finally:
+            self._flush_task = None
+        
+        pending, self._pending_updates = self._pending_updates, {}
+        for inst_id, (action, orderbook) in pending.items():
             for callback in self.data_callbacks:
                 try:
                     if asyncio.iscoroutinefunction(callback):
@@ -494,10 +627,6 @@ class DataCollector:
                 except Exception as e:
                     self.logger.error(f"数据更新回调执行失败: {e}")
                     self._record_error()
-                    
-        except Exception as e:
-            self.logger.error(f"处理数据更新事件失败: {e}")
-            self._record_error()
     
     def get_status(self) -> Dict[str, Any]:
         """
@@ -529,6 +658,38 @@ class DataCollector:
             self.ws_manager.get_orderbook(inst_id) is not None
         )
     
+    def _has_valid_orderbooks(self, inst_ids: List[str]) -> bool:
+        """检查缓存中是否已有全部交易对的有效订单簿"""
+        with self.cache_lock:
+            for inst_id in inst_ids:
+                orderbook = self.orderbook_cache.get(inst_id)
+                if orderbook is None or not orderbook.is_valid():
+                    return False
+        return True
+    
+    async def wait_until_ready(self, inst_ids: List[str], timeout: float = 10.0,
+                               poll_interval: float = 0.05) -> bool:
+        """
+        等待指定交易对都收到有效订单簿数据（替代固定时长的等待）
+        
+        数据到齐即返回，不必等满固定时长；网络较慢时最多等待timeout秒。
+        
+        Args:
+            inst_ids: 产品ID列表
+            timeout: 最长等待时间（秒）
+            poll_interval: 检查间隔（秒）
+        
+        Returns:
+            超时前数据是否已全部就绪
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self._has_valid_orderbooks(inst_ids):
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(poll_interval)
+        return True
+    
     async def add_trading_pair(self, inst_id: str) -> bool:
         """
         添加新的交易对订阅
@@ -603,7 +764,8 @@ class DataCollector:
         同步账户余额
         """
         try:
-            balance_data = self.rest_client.get_balance()
+            # REST请求在线程中执行，避免阻塞事件循环
+            balance_data = await asyncio.to_thread(self.rest_client.get_balance)
             if balance_data:
                 portfolio = Portfolio(
                     balances=balance_data,
@@ -2,6 +2,7 @@ from typing import Dict, Any, Optional, List, Union
 from decimal import Decimal
 from utils.logger import setup_logger
 import json
+from concurrent.futures import ThreadPoolExecutor
 import okex.Account_api as Account
 import okex.Market_api as Market
 import okex.Trade_api as Trade
@@ -201,6 +202,32 @@ class OKXClient:
             self.logger.error(f"获取{inst_id}订单簿失败: {e}")
             return None
     
+    def get_orderbooks(self, inst_ids: List[str], size: str = "20") -> Dict[str, OrderBook]:
+        """
+        批量获取多个产品的深度数据
+        
+        OKX的/api/v5/market/books每次只接受一个instId，这里在线程池中并发请求，
+        复用同一个HTTP/2连接池，总耗时约为一次往返而不是N次
+        
+        Args:
+            inst_ids: 产品ID列表
+            size: 深度档位数量，默认20
+            
+        Returns:
+            {inst_id: OrderBook}，获取失败的产品不包含在结果中
+        """
+        inst_ids = list(dict.fromkeys(inst_ids))
+        if not inst_ids:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=len(inst_ids)) as executor:
+            orderbooks = executor.map(lambda inst_id: self.get_orderbook(inst_id, size), inst_ids)
+            return {
+                inst_id: orderbook
+                for inst_id, orderbook in zip(inst_ids, orderbooks)
+                if orderbook is not None
+            }
+    
     def place_order(self, inst_id: str, side: str, order_type: str, 
                    size: str, price: str = None) -> Optional[str]:
         """
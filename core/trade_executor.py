@@ -256,7 +256,7 @@ class TradeExecutor:
             if not pre_check_result['success']:
                 self.logger.error(f"交易前检查失败: {pre_check_result['error']}")
                 record.success = False
-                record.end_time = datetime.now().timestamp()
+                record.end_time = time.monotonic()
                 self.trade_records.append(record)
                 return {
                     'success': False,
@@ -295,7 +295,7 @@ class TradeExecutor:
                 except ValueError as exc:
                     self.logger.error(f"解析交易对或方向失败: {exc}")
                     record.success = False
-                    record.end_time = datetime.now().timestamp()
+                    record.end_time = time.monotonic()
                     self.trade_records.append(record)
                     return {
                         'success': False,
@@ -311,7 +311,7 @@ class TradeExecutor:
                         opportunity.path
                     )
                     record.success = False
-                    record.end_time = datetime.now().timestamp()
+                    record.end_time = time.monotonic()
                     self.trade_records.append(record)
 
                     # 如果已有成功的前序腿，尝试回收中间资产
@@ -342,7 +342,7 @@ class TradeExecutor:
                 except ValueError as exc:
                     self.logger.error(f"计算订单数量失败: {exc}")
                     record.success = False
-                    record.end_time = datetime.now().timestamp()
+                    record.end_time = time.monotonic()
                     self.trade_records.append(record)
                     return {
                         'success': False,
@@ -434,7 +434,7 @@ class TradeExecutor:
                     opportunity.path
                 )
                 record.success = False
-                record.end_time = datetime.now().timestamp()
+                record.end_time = time.monotonic()
                 self.trade_records.append(record)
                 return {
                     'success': False,
@@ -449,7 +449,7 @@ class TradeExecutor:
             # 完成交易记录
             record.actual_profit = actual_profit
             record.success = True
-            record.end_time = datetime.now().timestamp()
+            record.end_time = time.monotonic()
             self.trade_records.append(record)
             
             self.logger.info(f"套利交易完成，实际利润: {actual_profit:.6f}, 利润率: {actual_profit_rate:.4%}")
@@ -469,7 +469,7 @@ class TradeExecutor:
             # 记录异常
             if 'record' in locals():
                 record.success = False
-                record.end_time = datetime.now().timestamp()
+                record.end_time = time.monotonic()
                 self.trade_records.append(record)
             return {
                 'success': False,
@@ -522,7 +522,7 @@ class TradeExecutor:
         )
 
         record.success = False
-        record.end_time = datetime.now().timestamp()
+        record.end_time = time.monotonic()
         if record not in self.trade_records:
             self.trade_records.append(record)
 
@@ -59,13 +59,19 @@ class TradingController:
         self.trading_loop_task = None
         
         # 交易控制
-        self.trading_interval = self.config_manager.get_trading_config().get('parameters', {}).get('monitor_interval', 1.0)
+        # 下限1ms：极小的间隔会让交易循环退化为sleep(0)忙等，占满CPU
+        self.trading_interval = max(
+            self.config_manager.get_trading_config().get('parameters', {}).get('monitor_interval', 1.0),
+            0.001
+        )
         self.max_concurrent_trades = 1  # 限制并发交易数量
         self.current_trades = 0
         
         # 交易统计
         self.stats = TradingStats(start_time=time.time())
         self.stats_lock = threading.Lock()
+        # 展示用统计（机会数/交易数/盈亏）每次变化时递增，供界面以整数比较判断是否需要刷新
+        self.stats_version = 0
         
         # 性能监控
         self.performance_start_time = time.time()
@@ -111,8 +117,8 @@ class TradingController:
                 self.status = SystemStatus.ERROR
                 return False
             
-            # 等待数据采集器稳定
-            await asyncio.sleep(2)
+            # 等待数据采集器稳定：订单簿到齐即继续，最多等待2秒
+            await self.data_collector.wait_until_ready(self.trading_pairs, timeout=2.0)
             
             # 注意：不再使用回调模式，直接在交易循环中获取套利机会
             # 这样可以更好地控制交易流程和时机
@@ -132,6 +138,7 @@ class TradingController:
             # 重置统计信息
             with self.stats_lock:
                 self.stats = TradingStats(start_time=time.time())
+                self.stats_version += 1
             
             self.status = SystemStatus.RUNNING
             self.logger.info("交易系统启动成功")
@@ -168,8 +175,8 @@ class TradingController:
             
             # 等待当前交易完成
             timeout = 30  # 30秒超时
-            start_time = time.time()
-            while self.current_trades > 0 and time.time() - start_time < timeout:
+            start_time = time.monotonic()
+            while self.current_trades > 0 and time.monotonic() - start_time < timeout:
                 self.logger.info(f"等待 {self.current_trades} 个交易完成...")
                 await asyncio.sleep(1)
             
@@ -213,18 +220,19 @@ class TradingController:
         """
         self.logger.info("主交易循环开始")
         loop_count = 0
-        last_stats_log = time.time()
+        # 循环计时与间隔判断使用单调时钟，不受系统时间调整影响
+        last_stats_log = time.monotonic()
         stats_log_interval = 300  # 每5分钟输出一次统计
         
         while self.is_running:
-            loop_start_time = time.time()
+            loop_start_time = time.monotonic()
             
             try:
                 loop_count += 1
                 self.logger.debug(f"开始第 {loop_count} 轮交易循环")
                 
                 # 定期输出统计信息
-                current_time = time.time()
+                current_time = time.monotonic()
                 if current_time - last_stats_log >= stats_log_interval:
                     self._log_periodic_stats()
                     if self.trade_logger:
@@ -245,6 +253,7 @@ class TradingController:
                     with self.stats_lock:
                         self.stats.total_opportunities += len(opportunities)
                         self.stats.last_opportunity_time = time.time()
+                        self.stats_version += 1
                     
                     # 记录套利机会到日志
                     if self.trade_logger:
@@ -283,7 +292,7 @@ class TradingController:
                 await asyncio.sleep(5)  # 异常后等待5秒再继续
             finally:
                 # 记录循环执行时间
-                loop_execution_time = time.time() - loop_start_time
+                loop_execution_time = time.monotonic() - loop_start_time
                 self.loop_execution_times.append(loop_execution_time)
                 
                 # 只保留最近100次的执行时间
@@ -292,11 +301,7 @@ class TradingController:
                 
                 # 更新性能统计
                 with self.stats_lock:
-                    self.stats.total_execution_time += loop_execution_time
-                    self.stats.min_execution_time = min(self.stats.min_execution_time, loop_execution_time)
-                    self.stats.max_execution_time = max(self.stats.max_execution_time, loop_execution_time)
-                    if loop_count > 0:
-                        self.stats.avg_execution_time = self.stats.total_execution_time / loop_count
+                    self.stats.record_execution(loop_execution_time)
                 
                 # 更新TradeLogger的性能指标
                 if self.trade_logger:
@@ -367,30 +372,35 @@ class TradingController:
             with self.stats_lock:
                 runtime = time.time() - self.stats.start_time
                 
-                self.logger.info("=== 交易系统定期统计 ===")
-                self.logger.info(f"运行时间: {runtime/60:.1f}分钟")
-                self.logger.info(f"发现机会: {self.stats.total_opportunities}个")
-                self.logger.info(f"执行交易: {self.stats.executed_trades}个")
-                self.logger.info(f"成功交易: {self.stats.successful_trades}个")
-                self.logger.info(f"失败交易: {self.stats.failed_trades}个")
-                self.logger.info(f"当前并发交易: {self.current_trades}个")
+                # 先收集所有行，释放锁后合并为一条日志输出
+                lines = [
+                    "=== 交易系统定期统计 ===",
+                    f"运行时间: {runtime/60:.1f}分钟",
+                    f"发现机会: {self.stats.total_opportunities}个",
+                    f"执行交易: {self.stats.executed_trades}个",
+                    f"成功交易: {self.stats.successful_trades}个",
+                    f"失败交易: {self.stats.failed_trades}个",
+                    f"当前并发交易: {self.current_trades}个",
+                ]
                 
                 if self.stats.executed_trades > 0:
                     success_rate = self.stats.successful_trades / self.stats.executed_trades
-                    self.logger.info(f"成功率: {success_rate:.2%}")
+                    lines.append(f"成功率: {success_rate:.2%}")
                 
-                self.logger.info(f"净利润: {self.stats.net_profit:.6f}")
+                lines.append(f"净利润: {self.stats.net_profit:.6f}")
                 
                 # 风险管理统计
                 risk_stats = self.risk_manager.get_risk_statistics()
-                self.logger.info(f"风险级别: {risk_stats['risk_level']}")
-                self.logger.info(f"拒绝机会: {risk_stats['rejected_opportunities']}个")
+                lines.append(f"风险级别: {risk_stats['risk_level']}")
+                lines.append(f"拒绝机会: {risk_stats['rejected_opportunities']}个")
                 
                 if runtime > 0:
                     opp_rate = self.stats.total_opportunities / runtime * 3600
                     trade_rate = self.stats.executed_trades / runtime * 3600
-                    self.logger.info(f"机会发现率: {opp_rate:.1f}个/小时")
-                    self.logger.info(f"交易执行率: {trade_rate:.1f}个/小时")
+                    lines.append(f"机会发现率: {opp_rate:.1f}个/小时")
+                    lines.append(f"交易执行率: {trade_rate:.1f}个/小时")
+            
+            self.logger.info("\n".join(lines))
                 
         except Exception as e:
             self.logger.error(f"输出定期统计异常: {e}")
@@ -416,7 +426,7 @@ class TradingController:
             
             try:
                 # 获取当前余额
-                portfolio = self.data_collector.get_balance()
+                portfolio = await self.data_collector.get_balance_async()
                 if not portfolio or not portfolio.balances:
                     self.logger.warning("余额不可用，跳过本次套利机会")
                     self.risk_manager.record_rejected_opportunity("余额不可用，跳过交易")
@@ -479,6 +489,7 @@ class TradingController:
                 with self.stats_lock:
                     self.stats.executed_trades += 1
                     self.stats.last_trade_time = time.time()
+                    self.stats_version += 1
                 
                 # 执行交易
                 result = await asyncio.to_thread(self.trade_executor.execute_arbitrage, arb_opportunity, trade_amount)
@@ -567,6 +578,7 @@ class TradingController:
                     else:
                         self.stats.total_loss += abs(profit)
                     self.stats.net_profit = self.stats.total_profit - self.stats.total_loss
+                    self.stats_version += 1
                 
                 # 记录到风险管理器
                 self.risk_manager.record_arbitrage_attempt(True, profit)
@@ -578,6 +590,7 @@ class TradingController:
                 # 更新统计
                 with self.stats_lock:
                     self.stats.failed_trades += 1
+                    self.stats_version += 1
                 
                 # 记录到风险管理器
                 self.risk_manager.record_arbitrage_attempt(False, 0)
@@ -743,25 +756,30 @@ class TradingController:
             with self.stats_lock:
                 runtime = time.time() - self.stats.start_time
                 
-                self.logger.info("=== 交易统计 ===")
-                self.logger.info(f"运行时间: {runtime:.1f}秒")
-                self.logger.info(f"发现机会: {self.stats.total_opportunities}个")
-                self.logger.info(f"执行交易: {self.stats.executed_trades}个")
-                self.logger.info(f"成功交易: {self.stats.successful_trades}个")
-                self.logger.info(f"失败交易: {self.stats.failed_trades}个")
-                self.logger.info(f"总利润: {self.stats.total_profit:.6f}")
-                self.logger.info(f"总损失: {self.stats.total_loss:.6f}")
-                self.logger.info(f"净利润: {self.stats.net_profit:.6f}")
+                # 先收集所有行，释放锁后合并为一条日志输出
+                lines = [
+                    "=== 交易统计 ===",
+                    f"运行时间: {runtime:.1f}秒",
+                    f"发现机会: {self.stats.total_opportunities}个",
+                    f"执行交易: {self.stats.executed_trades}个",
+                    f"成功交易: {self.stats.successful_trades}个",
+                    f"失败交易: {self.stats.failed_trades}个",
+                    f"总利润: {self.stats.total_profit:.6f}",
+                    f"总损失: {self.stats.total_loss:.6f}",
+                    f"净利润: {self.stats.net_profit:.6f}",
+                ]
                 
                 if self.stats.executed_trades > 0:
                     success_rate = self.stats.successful_trades / self.stats.executed_trades
-                    self.logger.info(f"成功率: {success_rate:.2%}")
+                    lines.append(f"成功率: {success_rate:.2%}")
                 
                 if runtime > 0:
                     opp_rate = self.stats.total_opportunities / runtime * 3600
                     trade_rate = self.stats.executed_trades / runtime * 3600
-                    self.logger.info(f"机会发现率: {opp_rate:.1f}个/小时")
-                    self.logger.info(f"交易执行率: {trade_rate:.1f}个/小时")
+                    lines.append(f"机会发现率: {opp_rate:.1f}个/小时")
+                    lines.append(f"交易执行率: {trade_rate:.1f}个/小时")
+            
+            self.logger.info("\n".join(lines))
                 
         except Exception as e:
             self.logger.error(f"记录最终统计异常: {e}")
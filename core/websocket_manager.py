@@ -8,6 +8,7 @@ import hmac
 import base64
 from typing import Dict, Any, List, Optional, Callable
 from config.config_manager import ConfigManager
+from utils.json_utils import loads as _json_loads, dumps as _json_dumps
 
 
 def partial(res):
@@ -336,13 +337,15 @@ class WebSocketManager:
             
             # 发送订阅请求
             sub_param = {"op": "subscribe", "args": channels}
-            sub_str = json.dumps(sub_param)
+            sub_str = _json_dumps(sub_param)
             
             await self.ws_public.send(sub_str)
             self.logger.info(f"发送订阅请求: {sub_str}")
             
-            # 记录订阅的频道
-            self.subscribed_channels.extend(channels)
+            # 记录订阅的频道（重复订阅同一频道只记录一次）
+            for channel in channels:
+                if channel not in self.subscribed_channels:
+                    self.subscribed_channels.append(channel)
             
             return True
             
@@ -350,6 +353,37 @@ class WebSocketManager:
             self.logger.error(f"订阅订单簿失败: {e}")
             return False
     
+    async def unsubscribe_orderbooks(self, inst_ids: List[str]) -> bool:
+        """
+        取消订阅订单簿数据（连接保持打开）
+        
+        Args:
+            inst_ids: 产品ID列表
+            
+        Returns:
+            取消订阅是否成功
+        """
+        try:
+            channels = [{"channel": "books", "instId": inst_id} for inst_id in inst_ids]
+            
+            # 无论请求能否发出，本地都不再视为已订阅，重连时也不会恢复这些频道
+            self.subscribed_channels = [ch for ch in self.subscribed_channels if ch not in channels]
+            for inst_id in inst_ids:
+                self.orderbook_data.pop(inst_id, None)
+            
+            if not self.is_connected or not self.ws_public:
+                return True
+            
+            unsub_str = _json_dumps({"op": "unsubscribe", "args": channels})
+            await self.ws_public.send(unsub_str)
+            self.logger.info(f"发送取消订阅请求: {unsub_str}")
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"取消订阅订单簿失败: {e}")
+            return False
+    
     async def _start_message_loop(self):
         """
         启动消息处理循环，参考websocket_example.py的subscribe_without_login
@@ -414,7 +448,7 @@ class WebSocketManager:
             
             # 解析JSON消息
             try:
-                data = json.loads(message)
+                data = _json_loads(message)
             except json.JSONDecodeError:
                 self.logger.warning(f"无法解析JSON消息: {message}")
                 return
@@ -684,7 +718,7 @@ class WebSocketManager:
             }]
         }
         
-        return json.dumps(login_param)
+        return _json_dumps(login_param)
     
     async def _connect_private_channel(self) -> bool:
         """
@@ -756,7 +790,7 @@ class WebSocketManager:
                 }]
             }
             
-            sub_str = json.dumps(sub_param)
+            sub_str = _json_dumps(sub_param)
             await self.ws_private.send(sub_str)
             self.logger.info(f"发送账户余额订阅请求: {sub_str}")
             
@@ -821,7 +855,7 @@ class WebSocketManager:
             
             # 解析JSON消息
             try:
-                data = json.loads(message)
+                data = _json_loads(message)
             except json.JSONDecodeError:
                 self.logger.warning(f"无法解析私有频道JSON消息: {message}")
                 return
@@ -10,22 +10,35 @@ Main features:
 """
 
 import asyncio
+import math
 import sys
 import os
+import queue
 import signal
+import threading
 import time
-import hashlib
-import json
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from typing import Optional, Any
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Optional, Any, Dict, Tuple
 
-# Ensure project directory is in Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Cheap non-cryptographic 128-bit digest for change detection: xxh3 when installed, otherwise 16-byte blake2b
+try:
+    from xxhash import xxh3_128_intdigest as _fasthash
+except ImportError:
+    def _fasthash(data: bytes) -> int:
+        return int.from_bytes(blake2b(data, digest_size=16).digest(), 'little')
+
+# Ensure project directory is at the front of the Python path (once)
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from core.trading_controller import TradingController
 from models.trade import SystemStatus
 from config.config_manager import ConfigManager
-from utils.logger import setup_logger
+from utils.logger import setup_logger, shutdown_logging
 from rich.console import Console
 from rich.live import Live
 from rich.layout import Layout
@@ -37,25 +50,119 @@ from rich import box
 from rich.rule import Rule
 
 
+# Profit-rate bucket boundaries (ascending); bucket id = bisect_left(_THRESHOLDS, rate).
+# A rate equal to a boundary falls into the lower bucket, matching the original strict '>' ladder.
+#   0: < -0.3% significant loss   1: -0.3% to -0.1% small loss   2: -0.1% to 0% near break-even
+#   3: 0% to 0.1% minimal profit  4: 0.1% to 0.3% moderate profit 5: >0.3% strong profit
+_THRESHOLDS = (-0.003, -0.001, 0.0, 0.001, 0.003)
+
+# Fully static status cells, indexed by bucket id
+_STATUS_STRINGS = (
+    "❌ [red]Loss[/red]",
+    "⚠️ [orange3]Small Loss[/orange3]",
+    "⚖️ [dim]Break-even[/dim]",
+    "⚠️ [yellow]Low Profit[/yellow]",
+    "✅ [green]Profitable[/green]",
+    "✅ [bright_green]High Profit[/bright_green]",
+)
+
+# Markup templates with a single positional numeric slot, indexed by bucket id
+_PROFIT_FORMATS = (
+    "[red]{:.3f}%[/red]",
+    "[orange3]{:.3f}%[/orange3]",
+    "[dim]{:+.3f}%[/dim]",
+    "[yellow]+{:.3f}%[/yellow]",
+    "[green]+{:.3f}%[/green]",
+    "[bright_green]+{:.3f}%[/bright_green]",
+)
+_RATE_FORMATS = (
+    "[red]{:.4%}[/red]",
+    "[orange3]{:.4%}[/orange3]",
+    "[dim]{:.4%}[/dim]",
+    "[yellow]{:.4%}[/yellow]",
+    "[green]{:.4%}[/green]",
+    "[bright_green]{:.4%}[/bright_green]",
+)
+
+
+# Balance deviation (vs initial) thresholds per asset, looked up with bisect_right:
+# strictly above the first is shown in yellow, at or above the second in red
+# (the first boundary is nudged one ulp up so a value exactly on it stays hidden)
+_ETH_DEVIATION_THRESHOLDS = (math.nextafter(0.001, math.inf), 0.01)
+_BTC_DEVIATION_THRESHOLDS = (math.nextafter(0.00001, math.inf), 0.0001)
+_DEVIATION_COLORS = ("", "yellow", "red")
+
+# Footer markup built once; only the analysis rate and count are filled in per refresh
+_FOOTER_TEMPLATE = (
+    "[bold]Controls:[/bold] [cyan]Ctrl+C[/cyan] to exit safely | [bold]Analysis Rate:[/bold] {:.1f}/sec | [bold]Total Analyses:[/bold] {}\n"
+    "[dim]System is actively analyzing all triangular arbitrage paths in real-time[/dim]"
+)
+
+# Panel attributes reset on every refresh of a pooled section panel (Rich's own Panel defaults)
+_PANEL_DEFAULTS = {"title": None, "style": "none", "border_style": "none", "box": box.ROUNDED}
+
+
+def _format_runtime(runtime: float) -> str:
+    """Format a runtime in seconds as 'Xh Ym', or 'Ym Zs' under an hour"""
+    hours = int(runtime // 3600)
+    minutes = int((runtime % 3600) // 60)
+    return f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m {int(runtime % 60)}s"
+
+
+def _price_format(pair: str) -> str:
+    """Price format string for a pair: BTC/ETH pairs get thousands separators, others 4 decimals"""
+    return '{:,.2f}' if 'BTC' in pair or 'ETH' in pair else '{:.4f}'
+
+
+@lru_cache(maxsize=512)
+def _render_analysis_row(path: str, profit_rate: float, timestamp: float) -> Tuple[str, str, str, str, str]:
+    """Render one analysis table row; analyses are immutable so rows are cached across refreshes"""
+    bucket = bisect_left(_THRESHOLDS, profit_rate)
+    profit_str = _PROFIT_FORMATS[bucket].format(profit_rate * 100)
+    rate_str = _RATE_FORMATS[bucket].format(profit_rate)
+    time_str = datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
+    return path[:25], profit_str, rate_str, _STATUS_STRINGS[bucket], time_str
+
+
 class TradingBot:
     """OKX Triangular Arbitrage Trading Bot Main Class"""
     
     def __init__(self):
         """Initialize trading bot"""
-        self.console = Console()
+        # Single console for prints and the Live monitor; no regex highlighting or emoji-code scan per string
+        self.console = Console(highlight=False, soft_wrap=False, markup=True, emoji=False)
         self.config_manager = ConfigManager()
         # 从配置文件读取日志路径
         system_config = self.config_manager.get_system_config()
         log_file = system_config.get('system_log_file', 'logs/system_runtime.log')
         self.logger = setup_logger("TradingBot", log_file)
+        
+        # Initial balances (trading section) are fixed for the process lifetime; read them once
+        self._initial_usdt = float(self.config_manager.get('trading', 'initial_usdt', default=0) or 0)
+        self._initial_usdc = float(self.config_manager.get('trading', 'initial_usdc', default=0) or 0)
+        self._initial_btc = float(self.config_manager.get('trading', 'initial_btc', default=0) or 0)
+        self._initial_eth = float(self.config_manager.get('trading', 'initial_eth', default=0) or 0)
         self.trading_controller: Optional[TradingController] = None
+        # Controller components resolved once in initialize_system (None until then)
+        self._engine = None
+        self._recent_analyses = None  # Engine's live analysis deque (newest first)
+        self._checks_per_sec = 0.0  # Engine analysis rate for the footer, fixed at initialization
+        self._risk_mgr = None
+        self._data = None
+        self._executor = None
+        self._trade_logger = None
         self.is_running = False
         self.shutdown_event = asyncio.Event()
+        # Set (thread-safely) whenever the engine records an analysis; wakes the monitor refresh early
+        self.data_changed_event = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self.all_analyses = []  # Store all arbitrage analyses
         self.key_prices = {}  # Store key trading pair prices
         self.arbitrage_pairs = set()  # Will hold trading pairs from arbitrage paths
+        self._pair_sorted = ()  # Sorted arbitrage pairs, built once with the pair set
+        self._pair_fmt = {}  # pair -> price format string, built once with the pair set
         
-        # Cache for rendered components to reduce flicker
+        # One Panel per layout section, created on first render and mutated in place afterwards
         self._cached_header = None
         self._cached_analyses = None
         self._cached_prices = None
@@ -68,11 +175,18 @@ class TradingBot:
         self._last_prices_update = 0
         self._last_statistics_update = 0
         self._last_footer_update = 0
+        self._last_footer_key: Optional[Tuple[float, int]] = None
         
-        # Previous data hashes for change detection
+        # Previous data hashes (128-bit ints) for change detection
         self._prev_analyses_hash = None
+        # Newest analysis record and record count seen at the last check (O(1) idle short-circuit)
+        self._prev_analysis_head = None
+        self._prev_analysis_count = 0
         self._prev_prices_hash = None
-        self._prev_stats_hash = None
+        # (stats_version, balance key, risk key) seen at the last statistics check
+        self._prev_stats_key: Optional[Tuple[Any, ...]] = None
+        # Balances prefetched off the event loop for the next statistics refresh (check and panel share them)
+        self._stats_balances: Optional[Dict[str, float]] = None
         
         # Update intervals (in seconds) - optimized for performance and real-time data
         self.HEADER_UPDATE_INTERVAL = 1.0  # Header updates every 1 second
@@ -80,15 +194,71 @@ class TradingBot:
         self.PRICES_UPDATE_INTERVAL = 0.5  # Prices update every 500ms (reduced from 200ms to reduce load)
         self.STATISTICS_UPDATE_INTERVAL = 2.0  # Stats update every 2 seconds (balance API calls)
         self.FOOTER_UPDATE_INTERVAL = 1.0  # Footer updates every 1 second
+        self.MAX_REFRESH_LATENCY = 0.5  # Monitor wakes at least this often without new data (timers/clock)
+        
+        # Monitor refresh task, cancelled directly on shutdown signals
+        self._monitor_task: Optional[asyncio.Task] = None
+        # Controller shutdown started from the signal handler; awaited by stop_trading
+        self._stop_task: Optional[asyncio.Task] = None
+        # Latest-layout handoff to the render thread (maxsize=1, older layouts are dropped)
+        self._snapshot_queue: Optional[queue.Queue] = None
+        # Held while the loop mutates the layout in place and while the render thread draws it (no torn frames)
+        self._render_lock = threading.Lock()
+        
+        # Persistent monitor layout (built on first render) and whether any section changed since the last push
+        self._layout: Optional[Layout] = None
+        self._layout_dirty = False
+        
+        # Offscreen state: while suspended (SIGTSTP) or not on a TTY the layout is left untouched
+        self._live_paused = False
         
-        # Set up signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Statistics panel pieces are built once and mutated in place on refresh:
+        # value cells are Text objects, the balance table is rebuilt only when balances change
+        self._stat_cells: Dict[str, Text] = {}
+        self._stats_table, self._risk_table = self._build_statistics_tables()
+        self._balance_table: Optional[Table] = None
+        self._last_balance_key: Optional[Tuple[float, float, float]] = None
+        self._stats_grid: Optional[Table] = None
+    
+    def _install_signal_handlers(self):
+        """Install SIGINT/SIGTERM handlers on the running event loop"""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._on_signal, sig)
+            except NotImplementedError:
+                # Event loop without signal support (e.g. Windows): hand off to the loop thread-safely
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(self._on_signal, signum))
+        
+        # Job control (POSIX only): stop rendering while suspended, resume on SIGCONT
+        if hasattr(signal, 'SIGTSTP'):
+            try:
+                loop.add_signal_handler(signal.SIGTSTP, self._on_suspend)
+                loop.add_signal_handler(signal.SIGCONT, self._on_resume)
+            except NotImplementedError:
+                pass
+    
+    def _on_suspend(self):
+        """Pause rendering, then suspend the process with the default SIGTSTP action"""
+        self._live_paused = True
+        loop = asyncio.get_running_loop()
+        loop.remove_signal_handler(signal.SIGTSTP)
+        os.kill(os.getpid(), signal.SIGTSTP)
     
-    def _signal_handler(self, signum, frame):
-        """Handle system signals"""
+    def _on_resume(self):
+        """Resume rendering after SIGCONT and re-arm the suspend handler"""
+        self._live_paused = False
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTSTP, self._on_suspend)
+    
+    def _on_signal(self, signum: int):
+        """Handle system signals inside the event loop"""
         self.logger.info(f"Received signal {signum}, preparing graceful exit...")
         self.shutdown_event.set()
+        if self._monitor_task and not self._monitor_task.done():
+            self._monitor_task.cancel()
+        # Start stopping the controller right away (on the loop) while the monitor tears down
+        if self.trading_controller and self._stop_task is None:
+            self._stop_task = asyncio.ensure_future(self.trading_controller.stop())
     
     def show_welcome(self):
         """Display welcome screen"""
@@ -234,12 +404,20 @@ class TradingBot:
                 self.trading_controller.disable_trading("Monitor mode")
                 self.console.print("[yellow]Trading disabled (Monitor mode)[/yellow]")
             
-            # Ensure the arbitrage engine has the recent_analyses list
-            # (This is now handled directly in the ArbitrageEngine class)
-            if hasattr(self.trading_controller, 'arbitrage_engine'):
-                engine = self.trading_controller.arbitrage_engine
-                # The recent_analyses list is now created in ArbitrageEngine.__init__
-                self.logger.info("Arbitrage engine ready with analysis tracking")
+            # Resolve controller components once so the monitor updaters skip attribute chains
+            self._engine = self.trading_controller.arbitrage_engine
+            self._recent_analyses = self._engine.recent_analyses
+            check_interval = getattr(self._engine, 'check_interval', 1.0)
+            self._checks_per_sec = 1.0 / check_interval if check_interval > 0 else 0
+            self._risk_mgr = self.trading_controller.risk_manager
+            self._data = self.trading_controller.data_collector
+            self._executor = self.trading_controller.trade_executor
+            self._trade_logger = self.trading_controller.trade_logger
+            
+            # Wake the monitor when new analyses arrive instead of polling on a fixed tick
+            self._loop = asyncio.get_running_loop()
+            self._engine.register_analysis_callback(self._on_analysis_recorded)
+            self.logger.info("Arbitrage engine ready with analysis tracking")
             
             self.console.print("[green]✅ System initialization completed[/green]")
             return True
@@ -261,11 +439,14 @@ class TradingBot:
                 raise Exception("Trading controller failed to start")
             
             self.is_running = True
+            self._install_signal_handlers()
             self.console.print("[green]✅ Trading system started successfully[/green]")
             
-            # Wait for initial data
+            # Wait for initial data; continue as soon as every pair has a valid orderbook
             self.console.print("[yellow]Waiting for data to stabilize...[/yellow]")
-            await asyncio.sleep(3)
+            await self.trading_controller.data_collector.wait_until_ready(
+                self.trading_controller.trading_pairs, timeout=3.0
+            )
             
             return True
             
@@ -274,8 +455,8 @@ class TradingBot:
             self.console.print(f"[red]❌ Start failed: {e}[/red]")
             return False
     
-    def create_monitor_layout(self) -> Layout:
-        """Create monitoring interface layout with intelligent caching"""
+    def _build_monitor_layout(self) -> Layout:
+        """Build the monitoring layout skeleton (once); sections are filled in by the updaters"""
         layout = Layout()
         
         # Split layout
@@ -291,48 +472,77 @@ class TradingBot:
             Layout(name="middle", ratio=1),  # Prices
             Layout(name="right", ratio=1)   # Stats
         )
+        return layout
+    
+    def create_monitor_layout(self) -> Layout:
+        """Return the persistent monitoring layout, updating only the sections that are due and changed"""
+        if self._layout is None:
+            self._layout = self._build_monitor_layout()
+            self._layout_dirty = True
+        layout = self._layout
         
-        current_time = time.time()
+        # Nobody is watching (suspended or not a terminal): leave the layout as it is
+        if self._cached_header is not None and (self._live_paused or not self.console.is_terminal):
+            return layout
+        
+        # Monotonic clock for interval gating (immune to wall-clock jumps); wall time read once per pass
+        current_time = time.monotonic()
+        now_dt = datetime.now()
         
         # Update header with caching (1 second interval)
         if self._cached_header is None or (current_time - self._last_header_update) >= self.HEADER_UPDATE_INTERVAL:
-            self._update_header(layout["header"])
+            self._update_header(layout["header"], now_dt)
             self._last_header_update = current_time
-        else:
-            layout["header"].update(self._cached_header)
+            self._layout_dirty = True
         
-        # Update analyses with caching (500ms interval) - simplified update logic
+        # Update analyses with caching (500ms interval) - only when the displayed analyses changed
         if self._cached_analyses is None or (current_time - self._last_analyses_update) >= self.ANALYSES_UPDATE_INTERVAL:
-            self._update_all_analyses(layout["left"])
             self._last_analyses_update = current_time
-        else:
-            layout["left"].update(self._cached_analyses)
+            if self._should_update_analyses() or self._cached_analyses is None:
+                self._update_all_analyses(layout["left"])
+                self._layout_dirty = True
         
-        # Update prices with caching (200ms interval) - prices always update
+        # Update prices with caching (500ms interval) - prices always update
         if self._cached_prices is None or (current_time - self._last_prices_update) >= self.PRICES_UPDATE_INTERVAL:
-            self._update_prices(layout["middle"])
             self._last_prices_update = current_time
-        else:
-            layout["middle"].update(self._cached_prices)
+            if self._should_update_prices() or self._cached_prices is None:
+                self._update_prices(layout["middle"], now_dt)
+                self._layout_dirty = True
         
-        # Update statistics with caching (1 second interval) - simplified update logic
+        # Update statistics with caching (2 second interval) - only when the stats changed
         if self._cached_statistics is None or (current_time - self._last_statistics_update) >= self.STATISTICS_UPDATE_INTERVAL:
-            self._update_statistics(layout["right"])
             self._last_statistics_update = current_time
-        else:
-            layout["right"].update(self._cached_statistics)
+            if self._should_update_statistics() or self._cached_statistics is None:
+                self._update_statistics(layout["right"])
+            elif self.trading_controller:
+                # Counters unchanged: only the runtime clock moves
+                self._stat_cells["Runtime"].plain = _format_runtime(time.time() - self.trading_controller.stats.start_time)
+            self._layout_dirty = True
         
         # Update footer with caching (1 second interval)
         if self._cached_footer is None or (current_time - self._last_footer_update) >= self.FOOTER_UPDATE_INTERVAL:
-            self._update_footer(layout["footer"])
+            if self._update_footer(layout["footer"]):
+                self._layout_dirty = True
             self._last_footer_update = current_time
-        else:
-            layout["footer"].update(self._cached_footer)
         
         return layout
     
-    def _update_header(self, layout: Layout):
+    def _fill_panel(self, slot: str, layout: Layout, renderable: Any, **options):
+        """Point a section's pooled Panel at new content, creating it (and attaching it to the layout) on first use"""
+        options = {**_PANEL_DEFAULTS, **options}
+        panel = getattr(self, slot)
+        if panel is None:
+            panel = Panel(renderable, **options)
+            setattr(self, slot, panel)
+            layout.update(panel)
+            return
+        panel.renderable = renderable
+        for name, value in options.items():
+            setattr(panel, name, value)
+    
+    def _update_header(self, layout: Layout, now_dt: Optional[datetime] = None):
         """Update header information"""
+        now_dt = now_dt or datetime.now()
         try:
             status = self.trading_controller.get_status() if self.trading_controller else {}
             status_text = status.get('status', 'unknown')
@@ -351,34 +561,26 @@ class TradingBot:
             mode = "Auto"
             mode_color = "green"
             
-            if self.trading_controller and hasattr(self.trading_controller, 'risk_manager'):
-                try:
-                    if hasattr(self.trading_controller.risk_manager, 'trading_enabled'):
-                        if not self.trading_controller.risk_manager.trading_enabled:
-                            mode = "Monitor"
-                            mode_color = "yellow"
-                except Exception as e:
-                    self.logger.debug(f"Error checking trading mode: {e}")
+            if self._risk_mgr and not self._risk_mgr.trading_enabled:
+                mode = "Monitor"
+                mode_color = "yellow"
             
             header_content = f"""
 [bold blue]🎯 OKX Triangular Arbitrage Trading System[/bold blue]
-[bold]Time:[/bold] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | [bold]Status:[/bold] [{color}]{status_text}[/{color}] | [bold]Mode:[/bold] [{mode_color}]{mode}[/{mode_color}] | [bold]Risk:[/bold] {status.get('risk_level', 'N/A')}
+[bold]Time:[/bold] {now_dt.strftime('%Y-%m-%d %H:%M:%S')} | [bold]Status:[/bold] [{color}]{status_text}[/{color}] | [bold]Mode:[/bold] [{mode_color}]{mode}[/{mode_color}] | [bold]Risk:[/bold] {status.get('risk_level', 'N/A')}
             """.strip()
             
-            self._cached_header = Panel(header_content, style="bold blue", box=box.DOUBLE)
-            layout.update(self._cached_header)
+            self._fill_panel("_cached_header", layout, header_content, style="bold blue", box=box.DOUBLE)
         except Exception as e:
             # Fallback header in case of error
-            header_content = f"[bold blue]🎯 OKX Triangular Arbitrage Trading System[/bold blue]\n{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            self._cached_header = Panel(header_content, style="bold blue")
-            layout.update(self._cached_header)
+            header_content = f"[bold blue]🎯 OKX Triangular Arbitrage Trading System[/bold blue]\n{now_dt.strftime('%Y-%m-%d %H:%M:%S')}"
+            self._fill_panel("_cached_header", layout, header_content, style="bold blue")
     
     def _update_all_analyses(self, layout: Layout):
         """Update all arbitrage analysis results"""
         try:
             if not self.trading_controller:
-                self._cached_analyses = Panel("[dim]No data[/dim]", title="Arbitrage Analysis")
-                layout.update(self._cached_analyses)
+                self._fill_panel("_cached_analyses", layout, "[dim]No data[/dim]", title="Arbitrage Analysis")
                 return
             
             # Create enhanced arbitrage analysis table with all results
@@ -390,52 +592,12 @@ class TradingBot:
             analysis_table.add_column("Time", style="white")
             
             # Get recent analyses from arbitrage engine
-            if hasattr(self.trading_controller, 'arbitrage_engine') and self.trading_controller.arbitrage_engine:
-                analyses = getattr(self.trading_controller.arbitrage_engine, 'recent_analyses', [])
-                
-                # Sort by timestamp (most recent first) for consistent ordering
-                sorted_analyses = sorted(analyses, key=lambda x: x.get('timestamp', 0), reverse=True)
-                
-                # Show last 15 analyses with color coding
-                for analysis in sorted_analyses[:15]:  # Changed to first 15 (most recent)
-                    path = analysis.get('path_name', 'Unknown')
-                    profit_rate = analysis.get('profit_rate', 0)
-                    profit_pct = profit_rate * 100  # Convert to percentage
-                    timestamp = datetime.fromtimestamp(analysis.get('timestamp', time.time())).strftime('%H:%M:%S')
-                    
-                    # Determine color and status based on profit rate
-                    if profit_rate > 0.003:  # >0.3% - Strong profit opportunity
-                        profit_str = f"[bright_green]+{profit_pct:.3f}%[/bright_green]"
-                        rate_str = f"[bright_green]{profit_rate:.4%}[/bright_green]"
-                        status = "✅ [bright_green]High Profit[/bright_green]"
-                    elif profit_rate > 0.001:  # 0.1% to 0.3% - Moderate profit
-                        profit_str = f"[green]+{profit_pct:.3f}%[/green]"
-                        rate_str = f"[green]{profit_rate:.4%}[/green]"
-                        status = "✅ [green]Profitable[/green]"
-                    elif profit_rate > 0:  # 0% to 0.1% - Minimal profit
-                        profit_str = f"[yellow]+{profit_pct:.3f}%[/yellow]"
-                        rate_str = f"[yellow]{profit_rate:.4%}[/yellow]"
-                        status = "⚠️ [yellow]Low Profit[/yellow]"
-                    elif profit_rate > -0.001:  # -0.1% to 0% - Near break-even
-                        profit_str = f"[dim]{profit_pct:+.3f}%[/dim]"
-                        rate_str = f"[dim]{profit_rate:.4%}[/dim]"
-                        status = "⚖️ [dim]Break-even[/dim]"
-                    elif profit_rate > -0.003:  # -0.3% to -0.1% - Small loss
-                        profit_str = f"[orange3]{profit_pct:.3f}%[/orange3]"
-                        rate_str = f"[orange3]{profit_rate:.4%}[/orange3]"
-                        status = "⚠️ [orange3]Small Loss[/orange3]"
-                    else:  # < -0.3% - Significant loss
-                        profit_str = f"[red]{profit_pct:.3f}%[/red]"
-                        rate_str = f"[red]{profit_rate:.4%}[/red]"
-                        status = "❌ [red]Loss[/red]"
-                    
-                    analysis_table.add_row(
-                        path[:25],
-                        profit_str,
-                        rate_str,
-                        status,
-                        timestamp
-                    )
+            if self._engine:
+                # Show last 15 analyses with color coding (rows memoized by path/rate/timestamp)
+                # The engine keeps analysis columns newest-first, so the head is already ordered
+                paths, profit_rates, timestamps = self._engine.get_recent_analysis_columns(15)
+                for path, profit_rate, timestamp in zip(paths, profit_rates, timestamps):
+                    analysis_table.add_row(*_render_analysis_row(path, profit_rate, timestamp))
             
             # Add empty row message if needed
             if analysis_table.row_count == 0:
@@ -453,8 +615,8 @@ class TradingBot:
             trades_table.add_column("Path", style="white")
             trades_table.add_column("Result", justify="right")
             
-            if self.trading_controller.trade_logger:
-                recent_trades = self.trading_controller.trade_logger.recent_trades
+            if self._trade_logger:
+                recent_trades = self._trade_logger.recent_trades
                 for trade in recent_trades[-5:]:
                     trade_time = datetime.fromtimestamp(trade.timestamp).strftime('%H:%M:%S')
                     if trade.success:
@@ -477,19 +639,17 @@ class TradingBot:
             combined.add_row(analysis_table)
             combined.add_row(trades_table)
             
-            self._cached_analyses = Panel(combined, title="🔍 Market Analysis", border_style="blue")
-            layout.update(self._cached_analyses)
+            self._fill_panel("_cached_analyses", layout, combined, title="🔍 Market Analysis", border_style="blue")
         except Exception as e:
             self.logger.error(f"Error updating analyses: {e}")
-            self._cached_analyses = Panel("[red]Error loading analysis data[/red]", title="Market Analysis")
-            layout.update(self._cached_analyses)
+            self._fill_panel("_cached_analyses", layout, "[red]Error loading analysis data[/red]", title="Market Analysis")
     
-    def _update_prices(self, layout: Layout):
+    def _update_prices(self, layout: Layout, now_dt: Optional[datetime] = None):
         """Update real-time price information"""
+        now_dt = now_dt or datetime.now()
         try:
-            if not self.trading_controller or not self.trading_controller.data_collector:
-                self._cached_prices = Panel("[dim]No price data[/dim]", title="Market Prices")
-                layout.update(self._cached_prices)
+            if not self._data:
+                self._fill_panel("_cached_prices", layout, "[dim]No price data[/dim]", title="Market Prices")
                 return
             
             price_table = Table(title="💹 Real-Time Prices", box=box.ROUNDED)
@@ -498,32 +658,28 @@ class TradingBot:
             price_table.add_column("Ask", style="red", justify="right")
             price_table.add_column("Spread", style="yellow", justify="right")
             
-            # Use only arbitrage-related trading pairs
-            key_pairs = sorted(list(self.arbitrage_pairs)) if self.arbitrage_pairs else ['BTC-USDT', 'ETH-USDT', 'ETH-BTC']
+            # Use only arbitrage-related trading pairs (pre-sorted when the pairs were extracted)
+            key_pairs = self._pair_sorted or ('BTC-USDT', 'ETH-USDT', 'ETH-BTC')
             
-            for pair in key_pairs:
-                orderbook = self.trading_controller.data_collector.get_orderbook(pair)
-                if orderbook and orderbook.is_valid():
-                    bid = orderbook.get_best_bid()
-                    ask = orderbook.get_best_ask()
-                    spread = orderbook.get_spread()
-                    spread_pct = (spread / ask * 100) if ask > 0 else 0
+            # Read best bid/ask/spread columns maintained by the data collector (no orderbook walk)
+            bids, asks, spreads = self._data.get_price_snapshot(key_pairs)
+            
+            # Accumulate spread totals while rendering rows (single pass over the pairs)
+            total_spread = 0.0
+            valid_spreads = 0
+            
+            for pair, bid, ask, spread_pct in zip(key_pairs, bids, asks, spreads):
+                if not math.isnan(bid):
+                    total_spread += spread_pct
+                    valid_spreads += 1
                     
-                    # Format prices based on pair
-                    if 'BTC' in pair:
-                        bid_str = f"{bid:,.2f}"
-                        ask_str = f"{ask:,.2f}"
-                    elif 'ETH' in pair:
-                        bid_str = f"{bid:,.2f}"
-                        ask_str = f"{ask:,.2f}"
-                    else:
-                        bid_str = f"{bid:.4f}"
-                        ask_str = f"{ask:.4f}"
+                    # Format prices with the pair's precomputed precision
+                    fmt = self._pair_fmt.get(pair) or _price_format(pair)
                     
                     price_table.add_row(
                         pair,
-                        bid_str,
-                        ask_str,
+                        fmt.format(bid),
+                        fmt.format(ask),
                         f"{spread_pct:.3f}%"
                     )
                 else:
@@ -540,21 +696,11 @@ class TradingBot:
             summary_table.add_column("Value", style="white", justify="right")
             
             # Calculate average spreads
-            total_spread = 0
-            valid_spreads = 0
-            
-            for pair in key_pairs:
-                orderbook = self.trading_controller.data_collector.get_orderbook(pair)
-                if orderbook and orderbook.is_valid():
-                    spread_pct = (orderbook.get_spread() / orderbook.get_best_ask() * 100)
-                    total_spread += spread_pct
-                    valid_spreads += 1
-            
             avg_spread = total_spread / valid_spreads if valid_spreads > 0 else 0
             
             summary_table.add_row("Avg Spread", f"{avg_spread:.3f}%")
             summary_table.add_row("Active Pairs", f"{valid_spreads}/{len(key_pairs)}")
-            summary_table.add_row("Update", datetime.now().strftime('%H:%M:%S'))
+            summary_table.add_row("Update", now_dt.strftime('%H:%M:%S'))
             
             # Combine tables
             combined = Table.grid(padding=1)
@@ -566,154 +712,172 @@ class TradingBot:
             # Color border based on market conditions
             border_color = "green" if avg_spread < 0.1 else "yellow" if avg_spread < 0.2 else "red"
             
-            self._cached_prices = Panel(combined, title="📊 Market Data", border_style=border_color)
-            layout.update(self._cached_prices)
+            self._fill_panel("_cached_prices", layout, combined, title="📊 Market Data", border_style=border_color)
         except Exception as e:
             self.logger.error(f"Error updating prices: {e}")
-            self._cached_prices = Panel("[red]Error loading price data[/red]", title="Market Prices")
-            layout.update(self._cached_prices)
+            self._fill_panel("_cached_prices", layout, "[red]Error loading price data[/red]", title="Market Prices")
     
     def _update_statistics(self, layout: Layout):
         """Update statistics information"""
         try:
             if not self.trading_controller:
-                self._cached_statistics = Panel("[dim]No data[/dim]", title="Statistics")
-                layout.update(self._cached_statistics)
+                self._fill_panel("_cached_statistics", layout, "[dim]No data[/dim]", title="Statistics")
                 return
             
             stats = self.trading_controller.get_stats()
-            
-            # Create a visually appealing statistics panel
-            stats_table = Table(title="📊 Trading Performance", box=box.ROUNDED)
-            stats_table.add_column("Metric", style="cyan")
-            stats_table.add_column("Value", style="white", justify="right")
+            cells = self._stat_cells
             
             # Runtime
-            runtime = stats.get('runtime_seconds', 0)
-            hours = int(runtime // 3600)
-            minutes = int((runtime % 3600) // 60)
-            runtime_str = f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m {int(runtime % 60)}s"
-            
-            # Add statistics with color coding
-            stats_table.add_row("Runtime", runtime_str)
+            cells["Runtime"].plain = _format_runtime(stats.get('runtime_seconds', 0))
             
+            # Statistics with color coding (style set on the cell instead of parsing markup)
             opportunities = stats.get('total_opportunities', 0)
-            opp_color = "green" if opportunities > 0 else "dim"
-            stats_table.add_row("Opportunities", f"[{opp_color}]{opportunities}[/{opp_color}]")
+            cells["Opportunities"].plain = str(opportunities)
+            cells["Opportunities"].style = "green" if opportunities > 0 else "dim"
             
             executed = stats.get('executed_trades', 0)
             successful = stats.get('successful_trades', 0)
-            
-            stats_table.add_row("Trades", f"{executed} / {successful} ✓")
+            cells["Trades"].plain = f"{executed} / {successful} ✓"
             
             success_rate = stats.get('success_rate', 0)
-            rate_color = "green" if success_rate > 0.7 else "yellow" if success_rate > 0.5 else "red"
-            stats_table.add_row("Success Rate", f"[{rate_color}]{success_rate:.1%}[/{rate_color}]")
+            cells["Success Rate"].plain = f"{success_rate:.1%}"
+            cells["Success Rate"].style = "green" if success_rate > 0.7 else "yellow" if success_rate > 0.5 else "red"
             
             net_profit = stats.get('net_profit', 0)
-            profit_color = "bright_green" if net_profit > 0 else "red" if net_profit < 0 else "white"
-            stats_table.add_row("Net Profit", f"[{profit_color}]{net_profit:+.6f}[/{profit_color}]")
+            cells["Net Profit"].plain = f"{net_profit:+.6f}"
+            cells["Net Profit"].style = "bright_green" if net_profit > 0 else "red" if net_profit < 0 else "white"
             
             # Risk statistics
-            risk_table = Table(title="⚠️ Risk Management", box=box.SIMPLE)
-            risk_table.add_column("Metric", style="cyan")
-            risk_table.add_column("Value", style="white", justify="right")
-            
             risk_stats = self.trading_controller.get_risk_stats()
             risk_level = risk_stats.get('risk_level', 'N/A')
-            risk_color = "green" if risk_level == "LOW" else "yellow" if risk_level == "MEDIUM" else "red"
-            risk_table.add_row("Risk Level", f"[{risk_color}]{risk_level}[/{risk_color}]")
-            risk_table.add_row("Rejected", str(risk_stats.get('rejected_opportunities', 0)))
+            cells["Risk Level"].plain = str(risk_level)
+            cells["Risk Level"].style = "green" if risk_level == "LOW" else "yellow" if risk_level == "MEDIUM" else "red"
+            cells["Rejected"].plain = str(risk_stats.get('rejected_opportunities', 0))
             
             # Balance summary - fetch real-time balance from OKX API
-            balance_table = Table(title="💰 Account Balance", box=box.SIMPLE)
-            balance_table.add_column("Asset", style="cyan")
-            balance_table.add_column("Amount", style="white", justify="right")
-            
             total_profit_usdt = 0.0  # For calculating total profit
-            # Get initial values from config (trading section)
-            initial_usdt = float(self.config_manager.get('trading', 'initial_usdt', default=0) or 0)
-            initial_usdc = float(self.config_manager.get('trading', 'initial_usdc', default=0) or 0)
-            initial_btc = float(self.config_manager.get('trading', 'initial_btc', default=0) or 0)
-            initial_eth = float(self.config_manager.get('trading', 'initial_eth', default=0) or 0)
-            
-            if self.trading_controller.trade_executor:
-                # Refresh balance every 2 seconds to balance real-time data with API limits
-                # Since STATISTICS_UPDATE_INTERVAL is 2 seconds, this will refresh appropriately
-                balances = self.trading_controller.trade_executor.balance_cache.get_balance(force_refresh=False)
+            balance_key = None
+            balance_rows: Tuple[Tuple[str, str], ...] = ()
+            
+            if self._executor:
+                # Balances are fetched every 2 seconds (STATISTICS_UPDATE_INTERVAL) by _prefetch_balances,
+                # outside the render lock, since the cache may fall back to a REST call
+                balances = self._stats_balances or {}
                 usdt_balance = balances.get("USDT", 0)
                 usdc_balance = balances.get("USDC", 0)
                 btc_balance = balances.get("BTC", 0)
                 eth_balance = balances.get("ETH", 0)
                 
-                # Display with proper precision matching OKX API
-                # USDT & USDC: 5 decimal places (stablecoins), BTC: 8 decimal places
-                balance_table.add_row("USDT", f"{usdt_balance:.5f}")
-                balance_table.add_row("ETH", f"{eth_balance:.6f}")
-                balance_table.add_row("BTC", f"{btc_balance:.8f}")
-                
                 # Calculate total profit based on USDT change only
                 # In triangular arbitrage, we start and end with USDT
                 # Other currencies should remain relatively stable
-                total_profit_usdt = usdt_balance - initial_usdt
-                
-                # Always show Total Profit, even if 0
-                balance_table.add_row("", "")  # Separator
-                profit_color = "bright_green" if total_profit_usdt > 0.00001 else "red" if total_profit_usdt < -0.00001 else "white"
-                balance_table.add_row("Total Profit", f"[{profit_color}]{total_profit_usdt:+.5f} USDT[/{profit_color}]")
-                
-                # Optionally show other currency changes for monitoring (should be minimal in triangular arbitrage)
-                profit_eth = eth_balance - initial_eth
-                profit_btc = btc_balance - initial_btc
-
-                # Only show details if there are significant deviations (which might indicate issues)
-                if abs(profit_eth) > 0.001 or abs(profit_btc) > 0.00001:
-                    balance_table.add_row("", "")
-                    balance_table.add_row("[dim]Deviations:[/dim]", "")
-
-                    if abs(profit_eth) > 0.001:
-                        deviation_color = "yellow" if abs(profit_eth) < 0.01 else "red"
-                        balance_table.add_row("  ETH", f"[{deviation_color}]{profit_eth:+.6f}[/{deviation_color}]")
-                    
-                    if abs(profit_btc) > 0.00001:
-                        deviation_color = "yellow" if abs(profit_btc) < 0.0001 else "red"
-                        balance_table.add_row("  BTC", f"[{deviation_color}]{profit_btc:+.8f}[/{deviation_color}]")
+                total_profit_usdt = usdt_balance - self._initial_usdt
+                balance_key = (usdt_balance, eth_balance, btc_balance)
             
-            # Combine all tables
-            combined = Table.grid(padding=1)
-            combined.add_column()
-            combined.add_row(stats_table)
-            combined.add_row(risk_table)
-            combined.add_row(balance_table)
+            # Balances rarely move between refreshes; only rebuild the balance table when they do
+            if self._balance_table is None or balance_key != self._last_balance_key:
+                if balance_key is not None:
+                    balance_rows = self._format_balance_rows(usdt_balance, eth_balance, btc_balance, total_profit_usdt)
+                self._balance_table = Table(title="💰 Account Balance", box=box.SIMPLE)
+                self._balance_table.add_column("Asset", style="cyan")
+                self._balance_table.add_column("Amount", style="white", justify="right")
+                for row in balance_rows:
+                    self._balance_table.add_row(*row)
+                self._last_balance_key = balance_key
+                self._stats_grid = None  # Grid must be re-assembled around the new table
+            
+            # Combine all tables (re-assembled only when the balance table was replaced)
+            if self._stats_grid is None:
+                combined = Table.grid(padding=1)
+                combined.add_column()
+                combined.add_row(self._stats_table)
+                combined.add_row(self._risk_table)
+                combined.add_row(self._balance_table)
+                self._stats_grid = combined
         
             # Dynamic border color based on total profit
             border_color = "green" if total_profit_usdt > 0 else "yellow" if total_profit_usdt == 0 else "red"
-            self._cached_statistics = Panel(combined, title="📈 Performance", border_style=border_color)
-            layout.update(self._cached_statistics)
+            self._fill_panel("_cached_statistics", layout, self._stats_grid, title="📈 Performance", border_style=border_color)
         except Exception as e:
             self.logger.error(f"Error updating statistics: {e}")
-            self._cached_statistics = Panel("[red]Error loading statistics[/red]", title="Performance")
-            layout.update(self._cached_statistics)
+            self._fill_panel("_cached_statistics", layout, "[red]Error loading statistics[/red]", title="Performance")
     
-    def _update_footer(self, layout: Layout):
-        """Update footer control information"""
+    def _build_statistics_tables(self) -> Tuple[Table, Table]:
+        """Build the trading performance and risk tables once, registering their value cells"""
+        stats_table = Table(title="📊 Trading Performance", box=box.ROUNDED)
+        stats_table.add_column("Metric", style="cyan")
+        stats_table.add_column("Value", style="white", justify="right")
+        for metric in ("Runtime", "Opportunities", "Trades", "Success Rate", "Net Profit"):
+            self._stat_cells[metric] = Text("")
+            stats_table.add_row(metric, self._stat_cells[metric])
+        
+        risk_table = Table(title="⚠️ Risk Management", box=box.SIMPLE)
+        risk_table.add_column("Metric", style="cyan")
+        risk_table.add_column("Value", style="white", justify="right")
+        for metric in ("Risk Level", "Rejected"):
+            self._stat_cells[metric] = Text("")
+            risk_table.add_row(metric, self._stat_cells[metric])
+        
+        return stats_table, risk_table
+    
+    def _format_balance_rows(self, usdt_balance: float, eth_balance: float, btc_balance: float,
+                             total_profit_usdt: float) -> Tuple[Tuple[str, str], ...]:
+        """Format the balance table rows (balances, total profit and significant deviations)"""
+        # Display with proper precision matching OKX API
+        # USDT & USDC: 5 decimal places (stablecoins), BTC: 8 decimal places
+        rows = [
+            ("USDT", f"{usdt_balance:.5f}"),
+            ("ETH", f"{eth_balance:.6f}"),
+            ("BTC", f"{btc_balance:.8f}"),
+        ]
+        
+        # Always show Total Profit, even if 0
+        rows.append(("", ""))  # Separator
+        profit_color = "bright_green" if total_profit_usdt > 0.00001 else "red" if total_profit_usdt < -0.00001 else "white"
+        rows.append(("Total Profit", f"[{profit_color}]{total_profit_usdt:+.5f} USDT[/{profit_color}]"))
+        
+        # Optionally show other currency changes for monitoring (should be minimal in triangular arbitrage)
+        profit_eth = eth_balance - self._initial_eth
+        profit_btc = btc_balance - self._initial_btc
+
+        # Deviation level per asset: 0 = insignificant (hidden), 1 = yellow, 2 = red
+        eth_level = bisect_right(_ETH_DEVIATION_THRESHOLDS, abs(profit_eth))
+        btc_level = bisect_right(_BTC_DEVIATION_THRESHOLDS, abs(profit_btc))
+
+        # Only show details if there are significant deviations (which might indicate issues)
+        if eth_level or btc_level:
+            rows.append(("", ""))
+            rows.append(("[dim]Deviations:[/dim]", ""))
+
+            if eth_level:
+                deviation_color = _DEVIATION_COLORS[eth_level]
+                rows.append(("  ETH", f"[{deviation_color}]{profit_eth:+.6f}[/{deviation_color}]"))
+            
+            if btc_level:
+                deviation_color = _DEVIATION_COLORS[btc_level]
+                rows.append(("  BTC", f"[{deviation_color}]{profit_btc:+.8f}[/{deviation_color}]"))
+        
+        return tuple(rows)
+    
+    def _update_footer(self, layout: Layout) -> bool:
+        """Update footer control information; return whether the footer content changed"""
         # Get system metrics
-        if self.trading_controller and hasattr(self.trading_controller, 'arbitrage_engine'):
-            engine = self.trading_controller.arbitrage_engine
-            analyses_count = len(getattr(engine, 'recent_analyses', []))
-            check_interval = getattr(engine, 'check_interval', 1.0)
-            checks_per_sec = 1.0 / check_interval if check_interval > 0 else 0
+        if self._recent_analyses is not None:
+            analyses_count = len(self._recent_analyses)
+            checks_per_sec = self._checks_per_sec
         else:
             analyses_count = 0
             checks_per_sec = 0
         
-        footer_content = f"""
-[bold]Controls:[/bold] [cyan]Ctrl+C[/cyan] to exit safely | [bold]Analysis Rate:[/bold] {checks_per_sec:.1f}/sec | [bold]Total Analyses:[/bold] {analyses_count}
-[dim]System is actively analyzing all triangular arbitrage paths in real-time[/dim]
-        """.strip()
+        # Nothing to redraw when neither number moved since the last refresh
+        footer_key = (checks_per_sec, analyses_count)
+        if self._cached_footer is not None and footer_key == self._last_footer_key:
+            return False
+        self._last_footer_key = footer_key
         
-        self._cached_footer = Panel(footer_content, style="bold yellow", box=box.DOUBLE_EDGE)
-        layout.update(self._cached_footer)
+        footer_content = _FOOTER_TEMPLATE.format(checks_per_sec, analyses_count)
+        self._fill_panel("_cached_footer", layout, footer_content, style="bold yellow", box=box.DOUBLE_EDGE)
+        return True
     
     async def run_monitor_loop(self):
         """Run monitoring loop with intelligent refresh"""
@@ -721,42 +885,125 @@ class TradingBot:
         self.console.print("[dim]Press Ctrl+C to exit safely[/dim]\n")
         
         try:
-            # Reduce refresh rate to 2Hz to minimize flicker
-            # The intelligent caching will still update data at appropriate intervals
-            with Live(self.create_monitor_layout(), refresh_per_second=2, screen=True) as live:
-                while self.is_running and not self.shutdown_event.is_set():
-                    # Update display - the caching mechanism handles update frequency
-                    live.update(self.create_monitor_layout())
-                    
-                    # Sleep for a shorter interval to maintain responsiveness
-                    # The actual update frequency is controlled by the caching logic
-                    await asyncio.sleep(0.1)
+            if self.shutdown_event.is_set():
+                return
+            
+            # Rich rendering runs in its own thread; this loop only builds layouts and posts them
+            self._snapshot_queue = queue.Queue(maxsize=1)
+            await self._prefetch_balances()
+            render_thread = threading.Thread(
+                target=self._render_thread, args=(self.create_monitor_layout(),),
+                name="MonitorRender", daemon=True
+            )
+            render_thread.start()
+            
+            # Signal handlers cancel this task directly, so shutdown does not wait for a poll
+            self._monitor_task = asyncio.create_task(self._refresh_monitor())
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                if not self.shutdown_event.is_set():
+                    raise
+                self.logger.info("Monitoring interface stopped by shutdown signal")
+            finally:
+                self._monitor_task = None
+                # Stop the renderer and wait for it to leave the alternate screen
+                self._publish_layout(None)
+                await asyncio.to_thread(render_thread.join, 2.0)
                     
         except KeyboardInterrupt:
             self.logger.info("User interrupted monitoring interface")
     
-    def _calculate_data_hash(self, data: Any) -> str:
-        """Calculate hash of data for change detection"""
+    def _render_thread(self, initial_layout: Layout):
+        """Own the Live display: render posted layouts, repaint at 2Hz in between"""
+        live = Live(initial_layout, console=self.console, auto_refresh=False, screen=True)
+        # The layout is shared with the event loop, so every render happens under the render lock
+        with self._render_lock:
+            live.start(refresh=True)
         try:
-            # Convert data to JSON string for consistent hashing
-            data_str = json.dumps(data, sort_keys=True, default=str)
-            return hashlib.md5(data_str.encode()).hexdigest()
-        except:
-            # If we can't serialize, just use str representation
-            return hashlib.md5(str(data).encode()).hexdigest()
+            while True:
+                try:
+                    layout = self._snapshot_queue.get(timeout=0.5)
+                except queue.Empty:
+                    # Nothing new; repaint so terminal resizes are picked up
+                    with self._render_lock:
+                        live.refresh()
+                    continue
+                if layout is None:
+                    break
+                with self._render_lock:
+                    live.update(layout, refresh=True)
+        finally:
+            with self._render_lock:
+                live.stop()
+    
+    def _publish_layout(self, layout: Optional[Layout]):
+        """Post a layout (or None to stop) to the render thread without blocking; drops an unrendered older one"""
+        while True:
+            try:
+                self._snapshot_queue.put_nowait(layout)
+                return
+            except queue.Full:
+                try:
+                    self._snapshot_queue.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    async def _refresh_monitor(self):
+        """Refresh the live display until the system stops running"""
+        while self.is_running:
+            # Only post to the renderer when a section actually changed;
+            # the render thread keeps repainting the same layout object in between,
+            # so in-place section updates wait for any render in progress to finish.
+            # Balances are read before taking the lock: a REST fallback must not block the loop or the renderer
+            await self._prefetch_balances()
+            with self._render_lock:
+                layout = self.create_monitor_layout()
+            if self._layout_dirty:
+                self._publish_layout(layout)
+                self._layout_dirty = False
+            
+            # Sleep until the engine reports new data, bounded by the max refresh latency
+            # The actual update frequency is still controlled by the caching logic
+            try:
+                await asyncio.wait_for(self.data_changed_event.wait(), timeout=self.MAX_REFRESH_LATENCY)
+            except asyncio.TimeoutError:
+                pass
+            self.data_changed_event.clear()
+    
+    async def _prefetch_balances(self):
+        """Read balances for a due statistics refresh in a worker thread (the cache may call the REST API)"""
+        if not self._executor or (self._cached_header is not None and (self._live_paused or not self.console.is_terminal)):
+            return
+        if self._cached_statistics is not None and (time.monotonic() - self._last_statistics_update) < self.STATISTICS_UPDATE_INTERVAL:
+            return
+        self._stats_balances = await asyncio.to_thread(self._executor.balance_cache.get_balance, False)
+    
+    def _on_analysis_recorded(self):
+        """Engine analysis callback; may run off the event loop thread, so hand the wakeup to the loop"""
+        if self._loop and not self.data_changed_event.is_set():
+            self._loop.call_soon_threadsafe(self.data_changed_event.set)
     
     def _should_update_analyses(self) -> bool:
         """Check if analyses data has changed"""
-        if not self.trading_controller or not hasattr(self.trading_controller, 'arbitrage_engine'):
+        if not self._engine:
             return True  # Always update if not initialized
         
-        analyses = getattr(self.trading_controller.arbitrage_engine, 'recent_analyses', [])
-        
         # Always update if we have new data
+        analyses = self._recent_analyses
         if not analyses and self._prev_analyses_hash is not None:
             return True  # Data was cleared, need update
         
-        current_hash = self._calculate_data_hash(analyses[-15:] if analyses else [])
+        # Analyses are only ever prepended: same head record and count means nothing new arrived
+        head = analyses[0] if analyses else None
+        if head is self._prev_analysis_head and len(analyses) == self._prev_analysis_count:
+            return False
+        self._prev_analysis_head = head
+        self._prev_analysis_count = len(analyses)
+        
+        # Hash the contiguous profit-rate and timestamp columns of the displayed head
+        _, profit_rates, timestamps = self._engine.get_recent_analysis_columns(15)
+        current_hash = _fasthash(profit_rates.tobytes() + timestamps.tobytes())
         
         if current_hash != self._prev_analyses_hash:
             self._prev_analyses_hash = current_hash
@@ -769,46 +1016,37 @@ class TradingBot:
         return True
     
     def _should_update_statistics(self) -> bool:
-        """Check if statistics have changed"""
+        """Check if statistics have changed: trade counters (stats_version), balances or risk state"""
         if not self.trading_controller:
             return True  # Always update if not initialized
         
-        try:
-            stats = self.trading_controller.get_stats()
-            current_hash = self._calculate_data_hash(stats)
-            
-            if current_hash != self._prev_stats_hash:
-                self._prev_stats_hash = current_hash
-                return True
-            return False
-        except:
-            return True  # Update on any error
+        # Balances and risk state move independently of the trade counters
+        balance_key = None
+        balances = self._stats_balances
+        if self._executor and balances is not None:
+            balance_key = (balances.get("USDT", 0), balances.get("ETH", 0), balances.get("BTC", 0))
+        risk_key = None
+        if self._risk_mgr:
+            risk_key = (self._risk_mgr.risk_level, self._risk_mgr.rejected_opportunities)
+        
+        key = (self.trading_controller.stats_version, balance_key, risk_key)
+        changed = key != self._prev_stats_key
+        self._prev_stats_key = key
+        return changed
     
     def _extract_arbitrage_pairs(self):
         """Extract trading pairs from arbitrage path configuration"""
-        self.arbitrage_pairs = set()
-        
         try:
-            # Get trading config
-            trading_config = self.config_manager.get_trading_config()
-            
-            # Get paths from config
-            paths = trading_config.get('paths', {})
+            # Get paths from trading config
+            paths = self.config_manager.get_trading_config().get('paths', {})
             
-            # Extract pairs from each path
-            for path_name, path_config in paths.items():
-                if isinstance(path_config, dict):
-                    steps = path_config.get('steps', [])
-                    
-                    # Extract pairs from steps
-                    for step in steps:
-                        pair = step.get('pair')
-                        if pair:
-                            self.arbitrage_pairs.add(pair)
-            
-            # If no pairs found, use default
-            if not self.arbitrage_pairs:
-                self.arbitrage_pairs = {'BTC-USDT', 'ETH-USDT', 'ETH-BTC'}
+            # Flatten every path's steps into one set of pairs (default pairs if none found)
+            self.arbitrage_pairs = {
+                step['pair']
+                for path_config in paths.values() if isinstance(path_config, dict)
+                for step in path_config.get('steps', ())
+                if step.get('pair')
+            } or {'BTC-USDT', 'ETH-USDT', 'ETH-BTC'}
             
             self.logger.info(f"Extracted arbitrage pairs: {self.arbitrage_pairs}")
             
@@ -816,6 +1054,10 @@ class TradingBot:
             self.logger.error(f"Error extracting arbitrage pairs: {e}")
             # Use default pairs
             self.arbitrage_pairs = {'BTC-USDT', 'ETH-USDT', 'ETH-BTC'}
+        
+        # Pair set is fixed from here on: sort once and pick each pair's price format once
+        self._pair_sorted = tuple(sorted(self.arbitrage_pairs))
+        self._pair_fmt = {pair: _price_format(pair) for pair in self._pair_sorted}
     
     async def stop_trading(self):
         """Stop trading system"""
@@ -823,7 +1065,10 @@ class TradingBot:
         
         try:
             if self.trading_controller:
-                success = await self.trading_controller.stop()
+                if self._stop_task is not None:
+                    success = await self._stop_task
+                else:
+                    success = await self.trading_controller.stop()
                 
                 if success:
                     self.console.print("[green]✅ Trading system stopped safely[/green]")
@@ -918,10 +1163,21 @@ class TradingBot:
 async def main():
     """Main entry point"""
     bot = TradingBot()
-    await bot.run()
+    try:
+        await bot.run()
+    finally:
+        # Drain queued log records to console/file before the process exits
+        shutdown_logging()
 
 
 if __name__ == "__main__":
+    # Use uvloop's libuv-based event loop when installed; the policy must be set before asyncio.run
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     # Run main program
     try:
         asyncio.run(main())
@@ -1 +1,6 @@
-"""数据模型定义模块"""
\ No newline at end of file
+"""数据模型定义模块"""
+
+import sys
+
+# dataclass(slots=True) 需要 Python 3.10+；更早的版本退回普通的实例字典
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
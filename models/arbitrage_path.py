@@ -4,78 +4,107 @@
 定义套利路径和套利机会的核心数据结构
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any, Tuple
-from datetime import datetime
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Tuple, Sequence
 
+from models import DATACLASS_SLOTS
 
-@dataclass
+
+# 基础资产优先级（数值越小越优先作为基础资产）：BTC > ETH > 其他币种 > USDT > USDC
+# 只读映射，键为驻留字符串，与路径中驻留后的资产符号直接命中
+_BASE_PRIORITY = MappingProxyType({sys.intern(asset): priority for asset, priority in {
+    'BTC': 1,
+    'ETH': 2,
+    'BNB': 3,
+    'USDT': 8,
+    'USDC': 9
+}.items()})
+_DEFAULT_PRIORITY = 5
+
+
+@lru_cache(maxsize=1024)
+def _resolve_path(path: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """
+    解析路径的交易对与交易方向（按路径缓存，同一环路只计算一次）
+    
+    Args:
+        path: 资产路径
+        
+    Returns:
+        (驻留后的资产路径, 交易对, 交易方向)
+    """
+    # 单次遍历：驻留资产符号（后续比较可直接命中同一对象），每个资产只查一次优先级，
+    # 与上一资产比较即可同时确定交易对与方向
+    assets = []
+    pairs = []
+    directions = []
+    from_asset = from_priority = None
+    for asset in path:
+        to_asset = sys.intern(asset)
+        to_priority = _BASE_PRIORITY.get(to_asset, _DEFAULT_PRIORITY)
+        if from_asset is not None:
+            # 基础资产在前，报价资产在后
+            if to_priority < from_priority:
+                pairs.append(f"{to_asset}-{from_asset}")
+                directions.append('buy')  # 用报价资产买基础资产
+            else:
+                pairs.append(f"{from_asset}-{to_asset}")
+                directions.append('sell')  # 卖基础资产得报价资产
+        assets.append(to_asset)
+        from_asset, from_priority = to_asset, to_priority
+    
+    return tuple(assets), tuple(pairs), tuple(directions)
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ArbitragePath:
     """
     套利路径数据模型
     
+    路径创建后不可变（资产以元组保存），交易对与交易方向在初始化时一次算出并缓存。
+    
     Attributes:
-        path: 套利路径，如['USDT', 'USDC', 'BTC', 'USDT']
+        path: 套利路径，如('USDT', 'USDC', 'BTC', 'USDT')，构造时也接受列表
+        pairs: 交易对（初始化时计算）
+        directions: 交易方向（初始化时计算）
     """
-    path: List[str]  # ['USDT', 'USDC', 'BTC', 'USDT']
+    path: Tuple[str, ...]  # ('USDT', 'USDC', 'BTC', 'USDT')
+    pairs: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    directions: Tuple[str, ...] = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        """数据验证"""
+        """数据验证，并取得（缓存的）交易对与交易方向"""
         if len(self.path) < 3:
             raise ValueError("套利路径至少需要3个资产")
         if self.path[0] != self.path[-1]:
             raise ValueError("套利路径必须形成闭环")
+        
+        assets, pairs, directions = _resolve_path(tuple(self.path))
+        object.__setattr__(self, 'path', assets)
+        object.__setattr__(self, 'pairs', pairs)
+        object.__setattr__(self, 'directions', directions)
     
-    def get_trading_pairs(self) -> List[str]:
+    def get_trading_pairs(self) -> Tuple[str, ...]:
         """
         获取交易对列表
         
         Returns:
-            交易对列表，如['USDC-USDT', 'BTC-USDC', 'USDT-BTC']
+            交易对元组，如('USDC-USDT', 'BTC-USDC', 'USDT-BTC')
         """
-        pairs = []
-        for i in range(len(self.path) - 1):
-            from_asset = self.path[i]
-            to_asset = self.path[i + 1]
-            
-            # 根据资产顺序确定交易对格式
-            # 通常基础资产在前，报价资产在后
-            if self._is_base_asset(to_asset, from_asset):
-                pairs.append(f"{to_asset}-{from_asset}")
-            else:
-                pairs.append(f"{from_asset}-{to_asset}")
-        
-        return pairs
+        return self.pairs
     
-    def get_trade_directions(self) -> List[str]:
+    def get_trade_directions(self) -> Tuple[str, ...]:
         """
         获取交易方向列表
         
         Returns:
-            交易方向列表，如['buy', 'buy', 'sell']
+            交易方向元组，如('buy', 'buy', 'sell')
         """
-        directions = []
-        pairs = self.get_trading_pairs()
-        
-        for i, pair in enumerate(pairs):
-            from_asset = self.path[i]
-            to_asset = self.path[i + 1]
-            
-            # 检查交易对格式来决定买卖方向
-            base_asset, quote_asset = pair.split('-')
-            
-            if from_asset == quote_asset and to_asset == base_asset:
-                directions.append('buy')  # 用报价资产买基础资产
-            elif from_asset == base_asset and to_asset == quote_asset:
-                directions.append('sell')  # 卖基础资产得报价资产
-            else:
-                # 需要反向交易
-                if from_asset == base_asset:
-                    directions.append('sell')
-                else:
-                    directions.append('buy')
-        
-        return directions
+        return self.directions
     
     def _is_base_asset(self, asset1: str, asset2: str) -> bool:
         """
@@ -88,16 +117,7 @@ class ArbitragePath:
         Returns:
             asset1是否应该作为基础资产
         """
-        # 简单的优先级排序：BTC > ETH > 其他币种 > USDT > USDC
-        priority = {
-            'BTC': 1,
-            'ETH': 2,
-            'BNB': 3,
-            'USDT': 8,
-            'USDC': 9
-        }
-        
-        return priority.get(asset1, 5) < priority.get(asset2, 5)
+        return _BASE_PRIORITY.get(asset1, _DEFAULT_PRIORITY) < _BASE_PRIORITY.get(asset2, _DEFAULT_PRIORITY)
     
     def get_step_count(self) -> int:
         """
@@ -131,7 +151,7 @@ class ArbitragePath:
         return " -> ".join(self.path)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ArbitrageOpportunity:
     """
     套利机会数据模型
@@ -161,7 +181,7 @@ class ArbitrageOpportunity:
         if self.min_amount <= 0:
             raise ValueError("最小交易金额必须为正数")
         if self.timestamp is None:
-            self.timestamp = datetime.now().timestamp()
+            self.timestamp = time.time()
         # 兼容性处理：如果设置了min_trade_amount但没有min_amount
         if self.min_trade_amount is not None and self.min_amount == 0:
             self.min_amount = self.min_trade_amount
@@ -214,7 +234,7 @@ class ArbitrageOpportunity:
         """
         return amount >= self.min_amount
     
-    def get_trading_pairs(self) -> List[str]:
+    def get_trading_pairs(self) -> Sequence[str]:
         """
         获取交易对列表
         
@@ -227,7 +247,7 @@ class ArbitrageOpportunity:
             return pairs
         return self.path.get_trading_pairs()
     
-    def get_trade_directions(self) -> List[str]:
+    def get_trade_directions(self) -> Sequence[str]:
         """
         获取交易方向列表
         
@@ -282,9 +302,34 @@ class ArbitrageOpportunity:
         if self.timestamp is None:
             return True
         
-        current_time = datetime.now().timestamp()
+        current_time = time.time()
         return (current_time - self.timestamp) > max_age_seconds
     
     def __str__(self) -> str:
         """字符串表示"""
         return f"ArbitrageOpportunity({self.path}, profit={self.profit_rate:.4f}, min={self.min_amount})"
+
+
+@dataclass(frozen=True)
+class ArbitrageAnalysis:
+    """
+    单次套利路径分析结果（无论是否盈利），记录后不可变
+    
+    使用 __slots__ 省去每条记录的实例字典；frozen 使其可哈希，可直接作为缓存键。
+    
+    Attributes:
+        path_name: 路径名称
+        profit_rate: 利润率
+        timestamp: 分析时间戳
+        is_profitable: 是否超过最小利润阈值
+        final_amount: 模拟执行后的最终金额
+        initial_amount: 模拟执行的初始金额
+    """
+    __slots__ = ('path_name', 'profit_rate', 'timestamp', 'is_profitable', 'final_amount', 'initial_amount')
+    
+    path_name: str
+    profit_rate: float
+    timestamp: float
+    is_profitable: bool
+    final_amount: float
+    initial_amount: float
@@ -4,11 +4,24 @@
 定义订单簿的核心数据结构和相关方法
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 
+import numpy as np
 
-@dataclass
+from models import DATACLASS_SLOTS
+
+
+def _to_levels(levels: List[List[float]]) -> np.ndarray:
+    """
+    将 [[price, size], ...] 转换为 (2, N) 的 float64 数组：第0行价格，第1行数量
+    """
+    if not levels:
+        return np.empty((2, 0), dtype=np.float64)
+    return np.asarray(levels, dtype=np.float64)[:, :2].T.copy()
+
+
+@dataclass(**DATACLASS_SLOTS)
 class OrderBook:
     """
     订单簿数据模型
@@ -18,11 +31,16 @@ class OrderBook:
         bids: 买单列表 [[price, size], ...]，按价格降序排列
         asks: 卖单列表 [[price, size], ...]，按价格升序排列
         timestamp: 时间戳
+    
+    深度计算使用按列存储（价格行、数量行）的 NumPy 数组，首次使用时由 bids/asks 构建并缓存；
+    订单簿创建后不应原地修改 bids/asks。
     """
     symbol: str
     bids: List[List[float]]
     asks: List[List[float]]
     timestamp: float
+    _bid_levels: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _ask_levels: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
     
     def get_best_bid(self) -> Optional[float]:
         """
@@ -89,6 +107,28 @@ class OrderBook:
             'asks': self.asks[:levels]
         }
     
+    def get_bid_levels(self) -> np.ndarray:
+        """
+        获取买盘深度数组
+        
+        Returns:
+            (2, N) float64 数组，第0行价格（降序），第1行数量
+        """
+        if self._bid_levels is None:
+            self._bid_levels = _to_levels(self.bids)
+        return self._bid_levels
+    
+    def get_ask_levels(self) -> np.ndarray:
+        """
+        获取卖盘深度数组
+        
+        Returns:
+            (2, N) float64 数组，第0行价格（升序），第1行数量
+        """
+        if self._ask_levels is None:
+            self._ask_levels = _to_levels(self.asks)
+        return self._ask_levels
+    
     def is_valid(self) -> bool:
         """
         检查订单簿数据是否有效
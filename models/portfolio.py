@@ -4,11 +4,14 @@
 定义投资组合的核心数据结构和相关方法
 """
 
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
 from typing import Dict, Optional, List
 
+from models import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class Portfolio:
     """
     投资组合数据模型
@@ -16,9 +19,25 @@ class Portfolio:
     Attributes:
         balances: 资产余额字典 {asset: balance}
         timestamp: 时间戳
+    
+    持有资产（余额大于0）的集合在初始化时建立，并由 update/add/subtract_balance 同步维护，
+    因此创建后应通过这些方法修改余额。
     """
     balances: Dict[str, float]
     timestamp: float
+    _held: Dict[str, None] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """建立持有资产集合（有序，按资产变为持有的先后）"""
+        self._held = {asset: None for asset, balance in self.balances.items() if balance > 0}
+    
+    def _set_balance(self, asset: str, balance: float) -> None:
+        """写入余额并同步持有资产集合"""
+        self.balances[asset] = balance
+        if balance > 0:
+            self._held[asset] = None
+        else:
+            self._held.pop(asset, None)
     
     def get_asset_balance(self, asset: str) -> float:
         """
@@ -42,7 +61,7 @@ class Portfolio:
         Returns:
             是否持有该资产
         """
-        return asset in self.balances and self.balances[asset] > 0
+        return asset in self._held
     
     def get_total_assets(self) -> List[str]:
         """
@@ -51,7 +70,7 @@ class Portfolio:
         Returns:
             资产符号列表
         """
-        return [asset for asset, balance in self.balances.items() if balance > 0]
+        return list(self._held)
     
     def get_total_balance_count(self) -> int:
         """
@@ -60,7 +79,7 @@ class Portfolio:
         Returns:
             资产数量
         """
-        return len(self.get_total_assets())
+        return len(self._held)
     
     def update_balance(self, asset: str, balance: float) -> None:
         """
@@ -70,7 +89,7 @@ class Portfolio:
             asset: 资产符号
             balance: 新的余额
         """
-        self.balances[asset] = balance
+        self._set_balance(asset, balance)
     
     def add_balance(self, asset: str, amount: float) -> None:
         """
@@ -81,7 +100,7 @@ class Portfolio:
             amount: 增加的数量
         """
         current_balance = self.get_asset_balance(asset)
-        self.balances[asset] = current_balance + amount
+        self._set_balance(asset, current_balance + amount)
     
     def subtract_balance(self, asset: str, amount: float) -> bool:
         """
@@ -96,10 +115,45 @@ class Portfolio:
         """
         current_balance = self.get_asset_balance(asset)
         if current_balance >= amount:
-            self.balances[asset] = current_balance - amount
+            self._set_balance(asset, current_balance - amount)
             return True
         return False
     
+    def apply_balance_changes(self, changes: Dict[str, float]) -> bool:
+        """
+        一次性应用多个资产的余额变化（如一条套利路径各步的收支）
+        
+        先检查所有扣减是否足够，全部满足才写入，避免部分应用
+        
+        Args:
+            changes: 资产余额变化 {asset: delta}，负数为扣减
+            
+        Returns:
+            是否成功应用（任一资产余额不足则不做任何修改）
+        """
+        balances = self.balances
+        new_balances = {asset: balances.get(asset, 0.0) + delta for asset, delta in changes.items()}
+        for asset, delta in changes.items():
+            if delta < 0 and new_balances[asset] < 0:
+                return False
+        
+        for asset, balance in new_balances.items():
+            self._set_balance(asset, balance)
+        return True
+    
+    def get_total_value(self, prices: Dict[str, float]) -> float:
+        """
+        按给定价格计算持有资产的总价值
+        
+        Args:
+            prices: 资产价格 {asset: price}（计价资产自身价格为1）
+            
+        Returns:
+            总价值，缺少价格的资产不计入
+        """
+        balances = self.balances
+        return math.fsum(balances[asset] * prices[asset] for asset in self._held if asset in prices)
+    
     def is_sufficient_balance(self, asset: str, required_amount: float) -> bool:
         """
         检查资产余额是否足够
@@ -120,7 +174,8 @@ class Portfolio:
         Returns:
             包含所有非零余额的字典
         """
-        return {asset: balance for asset, balance in self.balances.items() if balance > 0}
+        balances = self.balances
+        return {asset: balances[asset] for asset in self._held}
     
     def is_empty(self) -> bool:
         """
@@ -129,7 +184,7 @@ class Portfolio:
         Returns:
             是否为空
         """
-        return not any(balance > 0 for balance in self.balances.values())
+        return not self._held
     
     def copy(self) -> 'Portfolio':
         """
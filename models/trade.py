@@ -4,10 +4,13 @@
 定义交易的核心数据结构和相关方法
 """
 
+import sys
+import time
 from dataclasses import dataclass, field
 from typing import Optional, List, TYPE_CHECKING
 from enum import Enum
-from datetime import datetime
+
+from models import DATACLASS_SLOTS
 
 if TYPE_CHECKING:
     from models.arbitrage_path import ArbitrageOpportunity
@@ -38,7 +41,7 @@ class RiskLevel(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TradeResult:
     """
     交易结果数据模型
@@ -57,13 +60,13 @@ class TradeResult:
     filled_size: float = 0.0
     avg_price: float = 0.0
     error_message: Optional[str] = None
-    timestamp: float = field(default_factory=lambda: datetime.now().timestamp())
+    timestamp: float = field(default_factory=time.time)
     execution_time: float = 0.0
     fee: float = 0.0
     fee_currency: str = ""
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ArbitrageRecord:
     """
     套利交易记录
@@ -74,8 +77,8 @@ class ArbitrageRecord:
         expected_profit: 预期利润
         actual_profit: 实际利润
         trade_results: 交易结果列表
-        start_time: 开始时间
-        end_time: 结束时间
+        start_time: 开始时间（time.monotonic，仅用于计算耗时）
+        end_time: 结束时间（time.monotonic，仅用于计算耗时）
         success: 是否成功
     """
     opportunity: 'ArbitrageOpportunity'  # 套利机会对象
@@ -83,12 +86,12 @@ class ArbitrageRecord:
     expected_profit: float
     actual_profit: float = 0.0
     trade_results: List[TradeResult] = field(default_factory=list)
-    start_time: float = field(default_factory=lambda: datetime.now().timestamp())
+    start_time: float = field(default_factory=time.monotonic)
     end_time: Optional[float] = None
     success: bool = False
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RiskCheckResult:
     """
     风险检查结果数据模型
@@ -107,7 +110,7 @@ class RiskCheckResult:
     warnings: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TradingStats:
     """
     交易统计信息
@@ -123,11 +126,11 @@ class TradingStats:
     last_opportunity_time: float = 0.0
     last_trade_time: float = 0.0
     
-    # 新增性能指标
+    # 新增性能指标（由 record_execution 增量维护）
+    execution_count: int = 0
     total_execution_time: float = 0.0
     min_execution_time: float = float('inf')
     max_execution_time: float = 0.0
-    avg_execution_time: float = 0.0
     
     # 新增API统计
     api_call_count: int = 0
@@ -136,9 +139,30 @@ class TradingStats:
     # 新增系统资源统计
     peak_memory_usage: float = 0.0
     peak_cpu_usage: float = 0.0
+    
+    def record_execution(self, execution_time: float) -> None:
+        """
+        记录一次执行耗时，O(1) 更新总计/次数/最小/最大值
+        
+        Args:
+            execution_time: 执行耗时（秒）
+        """
+        self.execution_count += 1
+        self.total_execution_time += execution_time
+        if execution_time < self.min_execution_time:
+            self.min_execution_time = execution_time
+        if execution_time > self.max_execution_time:
+            self.max_execution_time = execution_time
+    
+    @property
+    def avg_execution_time(self) -> float:
+        """平均执行耗时（秒），按需由总计与次数计算"""
+        if self.execution_count == 0:
+            return 0.0
+        return self.total_execution_time / self.execution_count
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Trade:
     """
     交易数据模型
@@ -149,21 +173,32 @@ class Trade:
         size: 交易数量
         price: 交易价格
         order_id: 订单ID，可选
+        base_asset: 基础资产（初始化时由inst_id解析）
+        quote_asset: 报价资产（初始化时由inst_id解析）
     """
     inst_id: str
     side: str  # 'buy' or 'sell'
     size: float
     price: float
     order_id: Optional[str] = None
+    base_asset: str = field(init=False, repr=False, compare=False)
+    quote_asset: str = field(init=False, repr=False, compare=False)
+    _buy: bool = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        """数据验证"""
+        """数据验证，并解析交易对的基础/报价资产"""
         if self.side not in ['buy', 'sell']:
             raise ValueError("side must be 'buy' or 'sell'")
         if self.size <= 0:
             raise ValueError("size must be positive")
         if self.price <= 0:
             raise ValueError("price must be positive")
+        
+        base, _, quote = self.inst_id.partition('-')
+        self.base_asset = sys.intern(base)
+        self.quote_asset = sys.intern(quote)
+        # 方向在创建后不变；数量会被执行器按实际余额重算，名义价值不缓存
+        self._buy = self.side == 'buy'
     
     def get_notional_value(self) -> float:
         """
@@ -181,7 +216,7 @@ class Trade:
         Returns:
             是否为买单
         """
-        return self.side == 'buy'
+        return self._buy
     
     def is_sell(self) -> bool:
         """
@@ -190,7 +225,7 @@ class Trade:
         Returns:
             是否为卖单
         """
-        return self.side == 'sell'
+        return not self._buy
     
     def get_base_asset(self) -> str:
         """
@@ -199,7 +234,7 @@ class Trade:
         Returns:
             基础资产符号
         """
-        return self.inst_id.split('-')[0]
+        return self.base_asset
     
     def get_quote_asset(self) -> str:
         """
@@ -208,7 +243,7 @@ class Trade:
         Returns:
             报价资产符号
         """
-        return self.inst_id.split('-')[1]
+        return self.quote_asset
     
     def get_required_balance(self) -> tuple[str, float]:
         """
@@ -217,12 +252,8 @@ class Trade:
         Returns:
             (资产符号, 需要数量)
         """
-        if self.is_buy():
-            # 买入需要报价资产
-            return self.get_quote_asset(), self.get_notional_value()
-        else:
-            # 卖出需要基础资产
-            return self.get_base_asset(), self.size
+        # 买入需要报价资产，卖出需要基础资产
+        return (self.quote_asset, self.size * self.price) if self._buy else (self.base_asset, self.size)
     
     def get_receive_amount(self) -> tuple[str, float]:
         """
@@ -231,12 +262,8 @@ class Trade:
         Returns:
             (资产符号, 收到数量)
         """
-        if self.is_buy():
-            # 买入收到基础资产
-            return self.get_base_asset(), self.size
-        else:
-            # 卖出收到报价资产
-            return self.get_quote_asset(), self.get_notional_value()
+        # 买入收到基础资产，卖出收到报价资产
+        return (self.base_asset, self.size) if self._buy else (self.quote_asset, self.size * self.price)
     
     def to_order_params(self) -> dict:
         """
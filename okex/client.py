@@ -1,9 +1,25 @@
-import json
-
 import httpx
 
 from . import consts as c, utils, exceptions
 
+# request bodies are serialized straight to compact UTF-8 bytes (orjson when available)
+# and response bytes are parsed without a str round-trip
+from utils.json_utils import dumps_bytes as _dump_body, loads as _load_body
+
+
+# one pooled HTTP/2 client per base URL, shared by every API object; auth headers are per request
+_http_clients = {}
+# HTTP/2 multiplexes concurrent requests over one connection, so warming a single connection is enough;
+# keep it open across the 30s balance-sync gap instead of httpx's 5s default so periodic calls skip the TLS handshake
+_http_limits = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+
+def _get_http_client(base_api):
+    client = _http_clients.get(base_api)
+    if client is None:
+        client = _http_clients.setdefault(base_api, httpx.Client(base_url=base_api, http2=True, limits=_http_limits))
+    return client
+
 
 class Client(object):
 
@@ -14,7 +30,7 @@ class Client(object):
         self.PASSPHRASE = passphrase
         self.use_server_time = use_server_time
         self.flag = flag
-        self.client = httpx.Client(base_url=base_api, http2=True)
+        self.client = _get_http_client(base_api)
 
     def _request(self, method, request_path, params):
 
@@ -29,9 +45,11 @@ class Client(object):
         if self.use_server_time:
             timestamp = self._get_timestamp()
 
-        body = json.dumps(params) if method == c.POST else ""
+        # serialized once: the same bytes are signed and sent
+        body_bytes = _dump_body(params) if method == c.POST else b""
+        body = body_bytes.decode('utf-8')
 
-        sign = utils.sign(utils.pre_hash(timestamp, method, request_path, str(body)), self.API_SECRET_KEY)
+        sign = utils.sign(utils.pre_hash(timestamp, method, request_path, body), self.API_SECRET_KEY)
         header = utils.get_header(self.API_KEY, sign, timestamp, self.PASSPHRASE, self.flag)
 
         # send request
@@ -40,13 +58,13 @@ class Client(object):
         if method == c.GET:
             response = self.client.get(url, headers=header)
         elif method == c.POST:
-            response = self.client.post(url, data=body, headers=header)
+            response = self.client.post(url, content=body_bytes, headers=header)
 
         # exception handle
         if not str(response.status_code).startswith('2'):
             raise exceptions.OkexAPIException(response)
 
-        return response.json()
+        return _load_body(response.content)
 
     def _request_without_params(self, method, request_path):
         return self._request(method, request_path, {})
@@ -58,6 +76,6 @@ class Client(object):
         url = c.API_URL + c.SERVER_TIMESTAMP_URL
         response = self.client.get(url)
         if response.status_code == 200:
-            return response.json()['ts']
+            return _load_body(response.content)['ts']
         else:
             return ""
@@ -1,22 +1,34 @@
 import hmac
 import base64
 import time
-import datetime
+from functools import lru_cache
 from . import consts as c
 
 
 def clean_dict_none(d: dict) -> dict:
-    return {k:d[k] for k in d.keys() if d[k] != None}
+    return {k: v for k, v in d.items() if v is not None}
 
 
-def sign(message, secretKey):
-    mac = hmac.new(bytes(secretKey, encoding='utf8'), bytes(message, encoding='utf-8'), digestmod='sha256')
+@lru_cache(maxsize=8)
+def _hmac_template(secret_key):
+    # keyed once per secret; each signature copies the keyed state instead of re-keying
+    return hmac.new(bytes(secret_key, encoding='utf8'), digestmod='sha256')
+
+
+def sign(message, secretKey) -> str:
+    # message is normally the bytes from pre_hash; str is still accepted
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    mac = _hmac_template(secretKey).copy()
+    mac.update(message)
     d = mac.digest()
-    return base64.b64encode(d)
+    # header value as str; base64 output is pure ASCII
+    return base64.b64encode(d).decode('ascii')
 
 
-def pre_hash(timestamp, method, request_path, body):
-    return str(timestamp) + str.upper(method) + request_path + body
+def pre_hash(timestamp: str, method: str, request_path: str, body: str) -> bytes:
+    # method is one of the upper-case consts (c.GET / c.POST); encoded once so signing hashes the bytes directly
+    return (timestamp + method + request_path + body).encode('utf-8')
 
 
 def get_header(api_key, sign, timestamp, passphrase, flag):
@@ -31,28 +43,33 @@ def get_header(api_key, sign, timestamp, passphrase, flag):
 
 
 def parse_params_to_str(params):
-    params = clean_dict_none(params)
-    url = '?'
-    for key, value in params.items():
-        url = url + str(key) + '=' + str(value) + '&'
-    return url[0:-1]
+    # values are joined verbatim (no percent-encoding), so the signed path matches the baseline byte for byte
+    query = '&'.join(f"{k}={v}" for k, v in params.items() if v is not None)
+    return '?' + query if query else ''
+
+
+# 同一秒内复用已格式化的日期时间前缀
+_ts_second = -1
+_ts_prefix = ''
 
 
 def get_timestamp():
-    now = datetime.datetime.now(datetime.timezone.utc)
-    t = now.isoformat("T", "milliseconds")
-    # 移除+00:00时区信息，因为我们已经知道这是UTC时间
-    if t.endswith('+00:00'):
-        t = t[:-6]
-    return t + "Z"
+    global _ts_second, _ts_prefix
+    # 整数毫秒拆分，避免浮点截断误差；格式 YYYY-MM-DDTHH:MM:SS.mmmZ
+    sec, ms = divmod(int(time.time() * 1000), 1000)
+    if sec != _ts_second:
+        _ts_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))
+        _ts_second = sec
+    return f"{_ts_prefix}.{ms:03d}Z"
 
 
-def signature(timestamp, method, request_path, body, secret_key):
+def signature(timestamp: str, method: str, request_path: str, body, secret_key: str) -> str:
     if str(body) == '{}' or str(body) == 'None':
         body = ''
-    message = str(timestamp) + str.upper(method) + request_path + str(body)
+    message = (timestamp + method + request_path + str(body)).encode('utf-8')
 
-    mac = hmac.new(bytes(secret_key, encoding='utf8'), bytes(message, encoding='utf-8'), digestmod='sha256')
+    mac = _hmac_template(secret_key).copy()
+    mac.update(message)
     d = mac.digest()
 
-    return base64.b64encode(d)
+    return base64.b64encode(d).decode('ascii')
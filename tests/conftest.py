@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture
+def run_in_tmp_dir(tmp_path, monkeypatch):
+    """在临时目录中运行：TradingBot 的相对路径运行日志（logs/system_runtime.log）不写入仓库目录"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,121 @@
+import asyncio
+import math
+import time
+
+from core.data_collector import DataCollector
+from core.websocket_manager import WebSocketManager
+from models.order_book import OrderBook
+
+
+def _book(inst_id, bid, ask, timestamp):
+    return OrderBook(inst_id, [[bid, 1.0]], [[ask, 1.0]], timestamp)
+
+
+def test_price_snapshot_returns_best_prices_in_request_order():
+    collector = DataCollector()
+    now = time.time()
+    collector._store_orderbook('BTC-USDT', _book('BTC-USDT', 100.0, 101.0, now))
+    collector._store_orderbook('USDC-USDT', _book('USDC-USDT', 0.999, 1.0, now))
+
+    bids, asks, spreads = collector.get_price_snapshot(['USDC-USDT', 'ETH-USDT', 'BTC-USDT'])
+
+    assert bids[0] == 0.999 and asks[0] == 1.0
+    assert math.isnan(bids[1]) and math.isnan(asks[1]) and math.isnan(spreads[1])
+    assert bids[2] == 100.0 and asks[2] == 101.0
+    assert math.isclose(spreads[2], (101.0 - 100.0) / 101.0 * 100)
+
+
+def test_price_snapshot_keeps_quiet_pairs_unless_max_age_given():
+    collector = DataCollector()
+    now = time.time()
+    collector._store_orderbook('BTC-USDT', _book('BTC-USDT', 100.0, 101.0, now - 60))
+    collector._store_orderbook('ETH-USDT', _book('ETH-USDT', 10.0, 11.0, now))
+
+    # 显示用快照不做过期截断：没有新推送的交易对仍显示最近一次有效价格
+    bids, _, _ = collector.get_price_snapshot(['BTC-USDT', 'ETH-USDT'])
+    assert bids == [100.0, 10.0]
+
+    bids, asks, _ = collector.get_price_snapshot(['BTC-USDT', 'ETH-USDT'], max_age=collector.data_stale_threshold)
+    assert math.isnan(bids[0]) and math.isnan(asks[0])
+    assert bids[1] == 10.0
+
+
+def test_stop_on_shared_ws_manager_unsubscribes_without_closing():
+    ws_manager = WebSocketManager()
+    collector = DataCollector(ws_manager)
+    other_channel = {'channel': 'books', 'instId': 'ETH-USDT'}
+
+    def on_balance(balances):
+        pass
+
+    # 模拟已启动状态：连接由调用方持有，采集器订阅了BTC-USDT并注册了回调
+    ws_manager.is_connected = True
+    ws_manager.subscribed_channels = [{'channel': 'books', 'instId': 'BTC-USDT'}, other_channel]
+    ws_manager.orderbook_data['BTC-USDT'] = {}
+    ws_manager.add_data_callback(collector._on_data_update)
+    collector.set_balance_update_callback(on_balance)
+    ws_manager.set_balance_update_callback(on_balance)
+    collector.subscribed_pairs.add('BTC-USDT')
+    collector.is_running = True
+
+    assert asyncio.run(collector.stop()) is True
+
+    assert ws_manager.is_connected
+    assert ws_manager.subscribed_channels == [other_channel]
+    assert 'BTC-USDT' not in ws_manager.orderbook_data
+    assert collector._on_data_update not in ws_manager.data_update_callbacks
+    assert ws_manager.balance_update_callback is None
+
+
+def test_callbacks_coalesce_updates_within_one_window():
+    collector = DataCollector()
+    received = []
+    collector.add_data_callback(lambda inst_id, action, orderbook: received.append((inst_id, action, orderbook)))
+
+    async def run():
+        # 同一窗口内同一交易对的三次推送只通知一次，且为最新的订单簿
+        for i, bid in enumerate((100.0, 100.5, 101.0)):
+            await collector._on_data_update('BTC-USDT', 'update', [[bid, 1.0]], [[102.0, 1.0]], str(1000 + i))
+        await collector._on_data_update('ETH-USDT', 'snapshot', [[10.0, 1.0]], [[11.0, 1.0]], '1000')
+        assert received == []
+        await asyncio.sleep(collector.callback_batch_interval * 5)
+
+    asyncio.run(run())
+
+    assert [(inst_id, action) for inst_id, action, _ in received] == [('BTC-USDT', 'update'), ('ETH-USDT', 'snapshot')]
+    assert received[0][2].bids == [[101.0, 1.0]]
+    assert received[0][2].timestamp == 1.002
+    assert collector._flush_task is None
+
+
+def test_wait_until_ready_returns_once_books_arrive():
+    collector = DataCollector()
+    collector._store_orderbook('BTC-USDT', _book('BTC-USDT', 100.0, 101.0, time.time()))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, collector._store_orderbook, 'ETH-USDT', _book('ETH-USDT', 10.0, 11.0, time.time()))
+        start = loop.time()
+        ready = await collector.wait_until_ready(['BTC-USDT', 'ETH-USDT'], timeout=5.0, poll_interval=0.01)
+        return ready, loop.time() - start
+
+    ready, elapsed = asyncio.run(run())
+
+    assert ready is True
+    assert elapsed < 1.0
+
+
+def test_wait_until_ready_times_out_without_data():
+    collector = DataCollector()
+    collector._store_orderbook('BTC-USDT', _book('BTC-USDT', 100.0, 101.0, time.time()))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        ready = await collector.wait_until_ready(['BTC-USDT', 'ETH-USDT'], timeout=0.1, poll_interval=0.01)
+        return ready, loop.time() - start
+
+    ready, elapsed = asyncio.run(run())
+
+    assert ready is False
+    assert 0.1 <= elapsed < 1.0
@@ -1,7 +1,11 @@
 import asyncio
 
+import pytest
+
 from main import TradingBot
 
+pytestmark = pytest.mark.usefixtures('run_in_tmp_dir')
+
 
 def test_monitor_mode_allows_missing_api_credentials(monkeypatch):
     bot = TradingBot()
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from main import TradingBot
+
+pytestmark = pytest.mark.usefixtures('run_in_tmp_dir')
+
+
+def _deviation_rows(bot, eth_balance, btc_balance):
+    rows = bot._format_balance_rows(0.0, eth_balance, btc_balance, 0.0)
+    return {asset.strip(): value for asset, value in rows if asset.strip() in ('ETH', 'BTC') and value.startswith('[')}
+
+
+def test_balance_deviation_boundaries():
+    bot = TradingBot()
+    bot._initial_eth = 0.0
+    bot._initial_btc = 0.0
+
+    # 恰好等于显示阈值时不显示，恰好等于红色阈值时显示为红色
+    assert _deviation_rows(bot, 0.001, 0.00001) == {}
+    assert _deviation_rows(bot, 0.005, 0.00005) == {
+        'ETH': '[yellow]+0.005000[/yellow]',
+        'BTC': '[yellow]+0.00005000[/yellow]',
+    }
+    assert _deviation_rows(bot, 0.01, 0.0001) == {
+        'ETH': '[red]+0.010000[/red]',
+        'BTC': '[red]+0.00010000[/red]',
+    }
+
+
+def test_footer_reports_change_only_when_content_moves():
+    bot = TradingBot()
+    footer = bot._build_monitor_layout()["footer"]
+
+    # 首次绘制必然变化；数值未变时不重绘，脏标记也不应因此置位
+    assert bot._update_footer(footer) is True
+    assert bot._update_footer(footer) is False
+    bot._recent_analyses = []
+    bot._checks_per_sec = 12
+    assert bot._update_footer(footer) is True
+    assert bot._update_footer(footer) is False
+
+
+class _RecordingBalanceCache:
+    def __init__(self):
+        self.threads = []
+
+    def get_balance(self, force_refresh=False):
+        self.threads.append(threading.get_ident())
+        return {'USDT': 100.0, 'ETH': 1.0, 'BTC': 0.01}
+
+
+def test_balances_prefetched_off_loop_and_not_read_while_building_layout():
+    bot = TradingBot()
+    cache = _RecordingBalanceCache()
+    bot._executor = SimpleNamespace(balance_cache=cache)
+    bot.trading_controller = SimpleNamespace(
+        stats_version=0,
+        get_stats=lambda: {'runtime_seconds': 1},
+        get_risk_stats=lambda: {'risk_level': 'LOW', 'rejected_opportunities': 0},
+    )
+
+    # 余额在工作线程中读取（缓存可能回退到REST请求），不在事件循环线程里
+    asyncio.run(bot._prefetch_balances())
+    assert cache.threads and cache.threads[0] != threading.get_ident()
+    assert bot._stats_balances == {'USDT': 100.0, 'ETH': 1.0, 'BTC': 0.01}
+
+    # 持有渲染锁构建布局时只使用预取的余额，不再同步读取
+    with bot._render_lock:
+        bot.create_monitor_layout()
+    assert len(cache.threads) == 1
+    assert bot._last_balance_key == (100.0, 1.0, 0.01)
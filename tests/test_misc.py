@@ -21,10 +21,10 @@ import logging
 import sys
 import os
 import argparse
-import json
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+
 # 添加项目根目录到path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
@@ -34,16 +34,18 @@ from core.data_collector import DataCollector
 from core.arbitrage_engine import ArbitrageEngine
 from core.okx_client import OKXClient
 from utils.logger import setup_logger
+from utils.json_utils import dumps_bytes as json_dumps_bytes
 
 
 class MiscTests:
     """杂项测试集合类"""
     
+    # 固定属性集合；检测循环的计数器为局部整数，不再存放在stats字典中
+    __slots__ = ('logger', 'target_profit_rate')
+    
     def __init__(self):
         # 获取tests目录的绝对路径
         tests_dir = os.path.dirname(os.path.abspath(__file__))
-        # 确保日志目录存在
-        os.makedirs(os.path.join(tests_dir, "logs"), exist_ok=True)
         # 生成带时间戳的日志文件名
         test_start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = os.path.join(tests_dir, f"logs/test_misc_{test_start_time}.log")
@@ -63,13 +65,14 @@ class MiscTests:
         # 固定测试时长为1分钟
         duration_minutes = 1
         
-        stats = {
-            'total_checks': 0,
-            'opportunities_found': 0,
-            'consistency_failures': 0,
-            'data_age_rejections': 0,
-            'valid_opportunities': 0
-        }
+        # 计数用局部整数，机会率只在打印时计算
+        total_checks = 0
+        opportunities_found = 0
+        
+        # 订单簿未更新时复用上次结果，不重复计算
+        last_fingerprint = None
+        last_opportunities = []
+        info_enabled = self.logger.isEnabledFor(logging.INFO)
         
         # 初始化组件
         data_collector = DataCollector()
@@ -84,67 +87,106 @@ class MiscTests:
             print("❌ 数据采集启动失败")
             return
             
-        # 等待数据稳定
+        # 等待数据就绪（数据到齐即继续，最多等待10秒）
         print("⏳ 等待数据稳定...")
-        await asyncio.sleep(3)
+        if not await data_collector.wait_until_ready(trading_pairs, timeout=10):
+            print("⚠️  部分交易对订单簿未就绪，继续测试")
         
-        # 开始测试循环
-        test_start = time.time()
+        # 订单簿更新时唤醒检查，而不是固定间隔轮询
+        update_event = asyncio.Event()
+        
+        def _on_orderbook_update(inst_id, action, orderbook):
+            update_event.set()
+        
+        data_collector.add_data_callback(_on_orderbook_update)
+        
+        # 开始测试循环（单调时钟，不受系统时间调整影响）
+        monotonic = time.monotonic
+        test_start = monotonic()
         test_duration = duration_minutes * 60
-        check_interval = 2.0
+        deadline = test_start + test_duration
+        
+        # 进度由事件循环定时回调打印，检查循环内不再判断是否到点
+        loop = asyncio.get_running_loop()
+        progress_interval = 10.0
+        
+        def _print_progress():
+            nonlocal progress_handle
+            now = monotonic()
+            progress_pct = ((now - test_start) / test_duration) * 100
+            opportunity_rate = (opportunities_found / total_checks * 100) if total_checks else 0
+            print(f"📊 进度: {progress_pct:.1f}% | "
+                  f"检查次数: {total_checks} | "
+                  f"发现机会: {opportunities_found} | "
+                  f"机会率: {opportunity_rate:.2f}%")
+            if now + progress_interval < deadline:
+                progress_handle = loop.call_later(progress_interval, _print_progress)
         
         print(f"🔍 开始监控套利机会...")
-        print(f"检查间隔: {check_interval}秒")
+        print(f"检查触发: 订单簿更新（合并窗口 {data_collector.callback_batch_interval * 1000:.0f}ms）")
         print(f"数据一致性要求: 200ms内")
         print(f"数据新鲜度要求: 500ms内")
         print()
         
-        while time.time() - test_start < test_duration:
-            try:
-                stats['total_checks'] += 1
-                opportunities = arbitrage_engine.find_opportunities()
+        progress_handle = loop.call_later(progress_interval, _print_progress)
+        try:
+            while True:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(update_event.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                update_event.clear()
                 
-                if opportunities:
-                    stats['opportunities_found'] += len(opportunities)
-                    stats['valid_opportunities'] += len(opportunities)
+                try:
+                    total_checks += 1
+                    fingerprint = arbitrage_engine.snapshot_fingerprint()
+                    if fingerprint == last_fingerprint:
+                        opportunities = last_opportunities
+                    else:
+                        opportunities = arbitrage_engine.find_opportunities()
+                        last_fingerprint = fingerprint
+                        last_opportunities = opportunities
                     
-                    for opp in opportunities:
-                        profit_rate = opp.get('profit_rate', 0)
-                        path_name = opp.get('path_name', 'Unknown')
-                        self.logger.info(f"发现套利机会: {path_name}, 利润率: {profit_rate:.6%}")
+                    if opportunities:
+                        opportunities_found += len(opportunities)
                         
-            except Exception as e:
-                self.logger.error(f"检查套利机会时发生错误: {e}")
-            
-            await asyncio.sleep(check_interval)
-            
-            # 每分钟显示一次进度
-            elapsed = time.time() - test_start
-            if stats['total_checks'] % 30 == 0 and stats['total_checks'] > 0:
-                progress_pct = (elapsed / test_duration) * 100
-                print(f"📊 进度: {progress_pct:.1f}% | "
-                      f"检查次数: {stats['total_checks']} | "
-                      f"发现机会: {stats['opportunities_found']} | "
-                      f"机会率: {(stats['opportunities_found']/stats['total_checks']*100):.2f}%")
-        
-        # 停止数据采集
-        await data_collector.stop()
-        
-        # 显示最终结果
-        self._print_fix_results(stats, test_duration)
-        
-    def _print_fix_results(self, stats: Dict, test_duration: float):
+                        # find_opportunities返回的字典总是包含这两个键；日志延迟格式化，级别关闭时不拼接字符串
+                        if info_enabled:
+                            for opp in opportunities:
+                                self.logger.info("发现套利机会: %s, 利润率: %.6f%%",
+                                                 opp['path_name'], opp['profit_rate'] * 100)
+                            
+                except Exception as e:
+                    self.logger.error(f"检查套利机会时发生错误: {e}")
+        finally:
+            progress_handle.cancel()
+            
+            # 按实际运行时长统计（提前中断时不按计划时长计算）
+            elapsed = monotonic() - test_start
+            
+            # 停止数据采集
+            data_collector.remove_data_callback(_on_orderbook_update)
+            await data_collector.stop()
+            
+            # 显示最终结果
+            self._print_fix_results(total_checks, opportunities_found, elapsed)
+        
+    def _print_fix_results(self, total_checks: int, opportunities_found: int, elapsed: float):
         """打印套利修复测试结果"""
         print("\n" + "=" * 60)
         print("🎯 套利修复效果测试结果")
         print("=" * 60)
         
-        opportunity_rate = (stats['opportunities_found'] / stats['total_checks'] * 100) if stats['total_checks'] > 0 else 0
+        opportunity_rate = (opportunities_found / total_checks * 100) if total_checks > 0 else 0
         
         print(f"📊 统计数据:")
-        print(f"  ⏱️  测试时长: {test_duration/60:.1f} 分钟")
-        print(f"  🔍 总检查次数: {stats['total_checks']}")
-        print(f"  ✅ 发现套利机会: {stats['opportunities_found']}")
+        print(f"  ⏱️  测试时长: {elapsed/60:.1f} 分钟")
+        print(f"  🔍 总检查次数: {total_checks}")
+        print(f"  ⚡ 检查频率: {(total_checks / elapsed) if elapsed > 0 else 0:.2f} 次/秒")
+        print(f"  ✅ 发现套利机会: {opportunities_found}")
         print(f"  📈 套利机会率: {opportunity_rate:.4f}%")
         
         print(f"\n💡 效果分析:")
@@ -187,8 +229,8 @@ class MiscTests:
         tests_dir = os.path.dirname(os.path.abspath(__file__))
         os.makedirs(os.path.join(tests_dir, 'outputs'), exist_ok=True)
         output_file = os.path.join(tests_dir, 'outputs/test_misc_arbitrage_breakdown.json')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(calculation_result, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(json_dumps_bytes(calculation_result, indent=True, default=str))
         
         print(f"\n✅ 详细分析完成")
         print(f"📄 完整数据已保存到: tests/outputs/test_misc_arbitrage_breakdown.json")
@@ -205,10 +247,11 @@ class MiscTests:
             
             pairs = ['BTC-USDT', 'BTC-USDC', 'USDC-USDT']
             detailed_data = {}
+            orderbooks = okx_client.get_orderbooks(pairs, size="20")
             
             for pair in pairs:
                 print(f"\n🔍 获取 {pair} 详细数据...")
-                orderbook = okx_client.get_orderbook(pair, size="20")
+                orderbook = orderbooks.get(pair)
                 
                 if orderbook:
                     detailed_data[pair] = {
@@ -441,10 +484,11 @@ class MiscTests:
             okx_client = OKXClient()
             pairs = ['BTC-USDT', 'BTC-USDC', 'USDC-USDT']
             market_data = {}
+            orderbooks = okx_client.get_orderbooks(pairs, size="20")
             
             for pair in pairs:
                 print(f"\n🔍 获取 {pair} 订单簿...")
-                orderbook = okx_client.get_orderbook(pair, size="20")
+                orderbook = orderbooks.get(pair)
                 
                 if orderbook:
                     market_data[pair] = {
@@ -592,4 +636,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # 安装了uvloop时使用基于libuv的事件循环，需在asyncio.run之前设置策略
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -26,7 +26,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from config.config_manager import ConfigManager
-from models.arbitrage_path import ArbitragePath, ArbitrageOpportunity
+from models.arbitrage_path import ArbitragePath, ArbitrageOpportunity, ArbitrageAnalysis
 from models.order_book import OrderBook
 from models.portfolio import Portfolio
 from models.trade import Trade, TradeStatus
@@ -85,6 +85,40 @@ class TestArbitragePath(unittest.TestCase):
         self.assertEqual(len(path.get_trading_pairs()), 4)
         self.assertEqual(len(path.get_trade_directions()), 4)
     
+    def test_cached_pairs_and_directions(self):
+        """测试交易对与方向在初始化时缓存，路径不可重新赋值"""
+        path = ArbitragePath(path=["USDT", "ETH", "BTC", "USDT"])
+
+        self.assertEqual(path.get_trading_pairs(), ("ETH-USDT", "BTC-ETH", "BTC-USDT"))
+        self.assertEqual(path.get_trade_directions(), ("buy", "buy", "sell"))
+        self.assertIs(path.get_trading_pairs(), path.get_trading_pairs())
+
+        with self.assertRaises(AttributeError):
+            path.path = ["USDT", "BTC", "ETH", "USDT"]
+        # 资产以元组保存，不能原地修改而使缓存的交易对失效
+        self.assertEqual(path.path, ("USDT", "ETH", "BTC", "USDT"))
+        with self.assertRaises(TypeError):
+            path.path[1] = "BTC"
+
+    def test_path_value_equality(self):
+        """测试路径按有序资产比较：同一环路的不同起点需要不同起始资金，互不相等"""
+        path = ArbitragePath(path=["USDT", "BTC", "ETH", "USDT"])
+        same = ArbitragePath(path=["USDT", "BTC", "ETH", "USDT"])
+        rotated = ArbitragePath(path=["BTC", "ETH", "USDT", "BTC"])
+
+        self.assertEqual(path, same)
+        self.assertNotEqual(path, rotated)
+        self.assertEqual(rotated.get_start_asset(), "BTC")
+
+    def test_path_hashable(self):
+        """测试路径可哈希：可放入集合、作为字典键，相同路径去重"""
+        path = ArbitragePath(path=["USDT", "USDC", "BTC", "USDT"])
+        same = ArbitragePath(path=["USDT", "USDC", "BTC", "USDT"])
+
+        self.assertEqual(hash(path), hash(same))
+        self.assertEqual(len({path, same}), 1)
+        self.assertEqual({path: 1}[same], 1)
+
     def test_base_asset_priority(self):
         """测试基础资产优先级判断"""
         path = ArbitragePath(path=["USDT", "BTC", "USDT"])
@@ -224,6 +258,33 @@ class TestArbitrageOpportunity(unittest.TestCase):
         self.assertTrue(tiny_profit.is_profitable(threshold=0.000001))
 
 
+class TestArbitrageAnalysis(unittest.TestCase):
+    """测试ArbitrageAnalysis类"""
+    
+    def test_immutable_slotted_record(self):
+        """测试分析结果不可变且不带实例字典"""
+        analysis = ArbitrageAnalysis(
+            path_name="path1",
+            profit_rate=0.002,
+            timestamp=time.time(),
+            is_profitable=True,
+            final_amount=100.2,
+            initial_amount=100.0
+        )
+        
+        self.assertFalse(hasattr(analysis, '__dict__'))
+        with self.assertRaises(AttributeError):
+            analysis.profit_rate = 0.0
+    
+    def test_hashable_by_value(self):
+        """测试相同内容的分析结果哈希相等"""
+        fields = dict(path_name="path1", profit_rate=-0.001, timestamp=1700000000.0,
+                      is_profitable=False, final_amount=99.9, initial_amount=100.0)
+        
+        self.assertEqual(ArbitrageAnalysis(**fields), ArbitrageAnalysis(**fields))
+        self.assertEqual(hash(ArbitrageAnalysis(**fields)), hash(ArbitrageAnalysis(**fields)))
+
+
 class TestOrderBook(unittest.TestCase):
     """测试OrderBook类"""
     
@@ -326,6 +387,23 @@ class TestOrderBook(unittest.TestCase):
         self.assertEqual(len(depth['bids']), 2)  # 只有2档
         self.assertEqual(len(depth['asks']), 2)  # 只有2档
 
+    def test_depth_levels(self):
+        """测试按列存储的深度数组"""
+        orderbook = OrderBook(
+            symbol="BTC-USDT",
+            bids=[[50000.0, 1.0], [49900.0, 2.0]],
+            asks=[[50100.0, 1.0], [50200.0, 2.0]],
+            timestamp=time.time()
+        )
+
+        self.assertEqual(orderbook.get_ask_levels().shape, (2, 2))
+        self.assertEqual(orderbook.get_bid_levels()[0][1], 49900.0)
+        self.assertEqual(orderbook.get_ask_levels()[1].sum(), 3.0)
+        self.assertIs(orderbook.get_ask_levels(), orderbook.get_ask_levels())
+
+        empty = OrderBook(symbol="BTC-USDT", bids=[], asks=[], timestamp=time.time())
+        self.assertEqual(empty.get_bid_levels().shape, (2, 0))
+
 
 class TestPortfolio(unittest.TestCase):
     """测试Portfolio类"""
@@ -386,6 +464,34 @@ class TestPortfolio(unittest.TestCase):
         self.assertFalse(result)
         self.assertEqual(portfolio.get_asset_balance("USDT"), 1200.0)
     
+    def test_held_assets_follow_balance_updates(self):
+        """测试持有资产随余额更新同步变化"""
+        portfolio = Portfolio(balances={"USDT": 100.0, "BTC": 0.0}, timestamp=time.time())
+        self.assertEqual(portfolio.get_total_assets(), ["USDT"])
+        
+        portfolio.add_balance("BTC", 0.01)
+        self.assertTrue(portfolio.has_asset("BTC"))
+        
+        self.assertTrue(portfolio.subtract_balance("USDT", 100.0))
+        portfolio.update_balance("BTC", 0.0)
+        self.assertFalse(portfolio.has_asset("USDT"))
+        self.assertTrue(portfolio.is_empty())
+        self.assertEqual(portfolio.get_portfolio_summary(), {})
+    
+    def test_apply_balance_changes(self):
+        """测试批量应用余额变化（余额不足时整体不生效）"""
+        portfolio = Portfolio(balances={"USDT": 100.0}, timestamp=time.time())
+        
+        self.assertTrue(portfolio.apply_balance_changes({"USDT": -50.0, "BTC": 0.001}))
+        self.assertEqual(portfolio.get_asset_balance("USDT"), 50.0)
+        self.assertTrue(portfolio.has_asset("BTC"))
+        
+        self.assertFalse(portfolio.apply_balance_changes({"USDT": -60.0, "ETH": 1.0}))
+        self.assertEqual(portfolio.get_asset_balance("USDT"), 50.0)
+        self.assertFalse(portfolio.has_asset("ETH"))
+        
+        self.assertEqual(portfolio.get_total_value({"USDT": 1.0, "BTC": 50000.0}), 100.0)
+    
     def test_portfolio_value_calculation(self):
         """测试投资组合价值计算"""
         portfolio = Portfolio(
@@ -536,9 +642,6 @@ def run_tests():
     tests_dir = os.path.dirname(os.path.abspath(__file__))
     log_file = os.path.join(tests_dir, f"logs/test_models_{test_start_time}.log")
     
-    # 确保日志目录存在
-    os.makedirs(os.path.join(tests_dir, "logs"), exist_ok=True)
-    
     # 配置日志
     logger = setup_logger("test_models", log_file, logging.INFO)
     logger.info(f"开始运行models测试 - 模式: {'完整测试' if RUN_FULL_TEST else '基础测试'}")
@@ -551,6 +654,7 @@ def run_tests():
     test_classes = [
         TestArbitragePath,
         TestArbitrageOpportunity,
+        TestArbitrageAnalysis,
         TestOrderBook,
         TestPortfolio,
         TestTrade
@@ -0,0 +1,60 @@
+from okex import utils
+
+# 固定请求的期望值由原字符串拼接实现计算得出，用于锁定查询串与签名不变
+TIMESTAMP = '2024-01-02T03:04:05.678Z'
+SECRET = 'test-secret'
+
+
+def test_params_query_string_matches_previous_encoding():
+    params = {'instType': 'SPOT', 'instId': 'BTC-USDT,ETH-USDT', 'after': None, 'limit': 100}
+
+    assert utils.parse_params_to_str(params) == '?instType=SPOT&instId=BTC-USDT,ETH-USDT&limit=100'
+    assert utils.parse_params_to_str({'after': None}) == ''
+
+
+def test_params_query_string_keeps_values_verbatim():
+    # ISO时间、冒号与非ASCII值原样拼接，签名的请求路径与原实现逐字节一致
+    params = {'instId': 'BTC-USDT', 'after': '2024-01-02T03:04:05.678Z', 'clOrdId': 'arb:1 测试'}
+
+    assert utils.parse_params_to_str(params) == '?instId=BTC-USDT&after=2024-01-02T03:04:05.678Z&clOrdId=arb:1 测试'
+
+
+def test_get_request_signature_matches_previous_output():
+    request_path = '/api/v5/market/tickers' + utils.parse_params_to_str(
+        {'instType': 'SPOT', 'instId': 'BTC-USDT,ETH-USDT', 'limit': 100})
+    message = utils.pre_hash(TIMESTAMP, 'GET', request_path, '')
+
+    assert message == (TIMESTAMP + 'GET' + '/api/v5/market/tickers?instType=SPOT&instId=BTC-USDT,ETH-USDT&limit=100').encode('utf-8')
+    assert utils.sign(message, SECRET) == 'ehMUxGAS4iN+2xsSlJcpxDf0nPQI7qIleX3Iq1e/lLg='
+    # str 消息与 bytes 消息签名一致
+    assert utils.sign(message.decode('utf-8'), SECRET) == 'ehMUxGAS4iN+2xsSlJcpxDf0nPQI7qIleX3Iq1e/lLg='
+
+
+def test_post_request_signature_matches_previous_output():
+    body = '{"instId":"BTC-USDT","tdMode":"cash","side":"buy","ordType":"market","sz":"10"}'
+
+    expected = 'lm1VWlGAecn8BVxso1CArHoOS2CgsQabKIiG/ei9s2I='
+    assert utils.signature(TIMESTAMP, 'POST', '/api/v5/trade/order', body, SECRET) == expected
+    assert utils.sign(utils.pre_hash(TIMESTAMP, 'POST', '/api/v5/trade/order', body), SECRET) == expected
+
+
+def test_timestamp_iso_millisecond_format(monkeypatch):
+    monkeypatch.setattr(utils, '_ts_second', -1)
+    # 1704164645.078 = 2024-01-02T03:04:05.078Z，毫秒补足三位
+    monkeypatch.setattr(utils.time, 'time', lambda: 1704164645.078)
+
+    assert utils.get_timestamp() == '2024-01-02T03:04:05.078Z'
+
+
+def test_timestamp_prefix_refreshes_when_second_rolls_over(monkeypatch):
+    monkeypatch.setattr(utils, '_ts_second', -1)
+    now = [1704164645.998]
+    monkeypatch.setattr(utils.time, 'time', lambda: now[0])
+
+    assert utils.get_timestamp() == '2024-01-02T03:04:05.998Z'
+    now[0] = 1704164645.999
+    assert utils.get_timestamp() == '2024-01-02T03:04:05.999Z'
+    # 跨秒后重新格式化前缀，不能沿用上一秒的缓存
+    now[0] = 1704164646.001
+    assert utils.get_timestamp() == '2024-01-02T03:04:06.001Z'
+    assert utils._ts_second == 1704164646
@@ -30,7 +30,6 @@ Core功能综合测试脚本
 import asyncio
 import logging
 import time
-import json
 import traceback
 import sys
 import os
@@ -38,6 +37,10 @@ import argparse
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+
+import numpy as np
+import psutil
+
 # 添加项目根目录到path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
@@ -54,6 +57,24 @@ from config.config_manager import ConfigManager
 from models.arbitrage_path import ArbitragePath, ArbitrageOpportunity
 from models.order_book import OrderBook
 from utils.logger import setup_logger
+from utils.json_utils import dumps as json_dumps
+
+
+async def wait_until(predicate, timeout: float, interval: float = 0.05) -> bool:
+    """
+    轮询等待条件成立，替代固定时长的sleep
+    
+    条件满足即返回，不必等满固定时长；超过timeout秒仍未满足则返回False。
+    """
+    async def _poll():
+        while not predicate():
+            await asyncio.sleep(interval)
+    
+    try:
+        await asyncio.wait_for(_poll(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
 
 
 class CoreTester:
@@ -70,6 +91,16 @@ class CoreTester:
         self.test_results = {}
         self.start_time = time.time()
         
+        # 各测试共用的REST客户端（首次使用时创建），复用同一连接池
+        # ConfigManager本身是单例，无需额外缓存
+        self._okx_client = None
+        
+        # 各测试共用的WebSocket连接（setup中建立，teardown中关闭），避免每个测试重复握手
+        self._ws_manager = None
+        
+        # 当前进程句柄（性能测试复用）
+        self._process = psutil.Process()
+        
         # 设置日志
         test_start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = f"tests/logs/test_core_{test_start_time}.log"
@@ -78,6 +109,26 @@ class CoreTester:
         print(f"🚀 Core模块{'完整' if full_test else '快速'}测试")
         self.logger.info(f"Core测试器初始化完成，日志文件: {log_file}")
     
+    def _get_okx_client(self) -> OKXClient:
+        """获取共用的OKX REST客户端，首次调用时创建"""
+        if self._okx_client is None:
+            self._okx_client = OKXClient()
+        return self._okx_client
+    
+    async def setup(self):
+        """建立共用的WebSocket连接，失败时各测试回退为自建连接"""
+        ws_manager = WebSocketManager()
+        if await ws_manager.connect():
+            self._ws_manager = ws_manager
+        else:
+            self.logger.warning("共用WebSocket连接建立失败，由各测试自行连接")
+    
+    async def teardown(self):
+        """关闭共用的WebSocket连接"""
+        if self._ws_manager is not None:
+            await self._ws_manager.disconnect()
+            self._ws_manager = None
+    
     def log_test_result(self, test_name: str, success: bool, details: Dict):
         """记录测试结果"""
         self.test_results[test_name] = {
@@ -88,7 +139,8 @@ class CoreTester:
         
         status = 'passed' if success else 'failed'
         self.logger.info(f"{test_name}: {status}")
-        self.logger.info(f"详情: {json.dumps(details, ensure_ascii=False)}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("详情: %s", json_dumps(details, default=str))
     
     async def run_all_tests(self):
         """运行所有测试"""
@@ -100,9 +152,22 @@ class CoreTester:
         passed = 0
         total = 0
         
-        tests = [
+        # 预热：创建共用客户端（初始化时会请求交易对精度规则），TCP/TLS连接在计时的测试开始前建立并进入连接池
+        try:
+            await asyncio.to_thread(self._get_okx_client)
+        except Exception as e:
+            self.logger.warning(f"预热OKX客户端失败，由各测试自行处理: {e}")
+        
+        await self.setup()
+        
+        # 互不共享状态的测试并发运行，网络/文件I/O等待相互重叠
+        independent_tests = [
             ('test_config_manager', self.test_config_manager),
             ('test_okx_api', self.test_okx_api),
+        ]
+        # 依次启动DataCollector/WebSocket的测试顺序运行，避免同时建立多个连接；
+        # 性能测试与错误处理测试（含突发请求）也顺序运行，不与其他测试争用同一份API限流额度
+        sequential_tests = [
             ('test_data_collector', self.test_data_collector),
             ('test_arbitrage_engine', self.test_arbitrage_engine),
             ('test_risk_manager', self.test_risk_manager),
@@ -110,14 +175,25 @@ class CoreTester:
         ]
         
         if self.full_test:
-            tests.extend([
-                ('test_websocket', self.test_websocket),
+            independent_tests.append(('test_websocket', self.test_websocket))
+            sequential_tests.extend([
                 ('test_integration', self.test_integration),
                 ('test_performance', self.test_performance),
                 ('test_error_handling', self.test_error_handling),
             ])
         
-        for test_name, test_func in tests:
+        # log_test_result 是同步方法，协程之间不会交错写入test_results，无需加锁
+        results = await asyncio.gather(*(test_func() for _, test_func in independent_tests),
+                                       return_exceptions=True)
+        for (test_name, _), result in zip(independent_tests, results):
+            total += 1
+            if isinstance(result, BaseException):
+                self.logger.error(f"测试 {test_name} 异常: {str(result)}")
+                self.logger.error(''.join(traceback.format_exception(type(result), result, result.__traceback__)))
+            elif result:
+                passed += 1
+        
+        for test_name, test_func in sequential_tests:
             total += 1
             try:
                 if await test_func():
@@ -126,6 +202,8 @@ class CoreTester:
                 self.logger.error(f"测试 {test_name} 异常: {str(e)}")
                 self.logger.error(traceback.format_exc())
         
+        await self.teardown()
+        
         # 输出总结
         print("\n" + "="*60)
         print(f"📊 {'完整' if self.full_test else '快速'}测试完成")
@@ -143,7 +221,7 @@ class CoreTester:
     async def test_config_manager(self) -> bool:
         """测试配置管理器"""
         print("\n1️⃣ 测试配置管理器...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
             config = ConfigManager()
@@ -179,7 +257,7 @@ class CoreTester:
             # 测试风险配置
             risk_config = config.get_risk_config()
             
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('config_test', True, {
                 'duration': f"{test_duration:.2f}s",
                 'api_configured': True,
@@ -191,7 +269,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('config_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -202,28 +280,32 @@ class CoreTester:
     async def test_okx_api(self) -> bool:
         """测试OKX API连接"""
         print("\n2️⃣ 测试OKX API连接...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
-            # 创建客户端
-            client = OKXClient()
+            # 获取共用客户端
+            client = self._get_okx_client()
+            
+            # 余额、订单簿、ticker三个REST请求互不依赖，放到线程中并发发出
+            balance, orderbook, ticker = await asyncio.gather(
+                asyncio.to_thread(client.get_balance),
+                asyncio.to_thread(client.get_orderbook, "BTC-USDT"),
+                asyncio.to_thread(client.get_ticker, "BTC-USDT")
+            )
             
             # 测试账户余额获取
-            balance = client.get_balance()
             if not balance:
                 raise ValueError("无法获取账户余额")
             
             # 测试市场数据获取
-            orderbook = client.get_orderbook("BTC-USDT")
             if not orderbook:
                 raise ValueError("无法获取订单簿数据")
             
             # 测试ticker获取
-            ticker = client.get_ticker("BTC-USDT")
             if not ticker:
                 self.logger.warning("无法获取ticker数据")
             
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('okx_api_test', True, {
                 'duration': f"{test_duration:.2f}s",
                 'balance_currencies': len(balance),
@@ -235,7 +317,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('okx_api_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -246,34 +328,30 @@ class CoreTester:
     async def test_data_collector(self) -> bool:
         """测试数据采集器"""
         print("\n3️⃣ 测试数据采集器...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
             # 创建数据采集器
-            collector = DataCollector()
+            collector = DataCollector(self._ws_manager)
             
             # 启动采集器
             await collector.start()
             
-            # 等待数据采集
-            await asyncio.sleep(3)
+            # 等待数据采集（数据到齐即继续）
+            test_pairs = ("BTC-USDT", "BTC-USDC", "USDC-USDT")
+            await collector.wait_until_ready(test_pairs, timeout=10)
             
-            # 检查采集的数据
-            test_pairs = ["BTC-USDT", "BTC-USDC", "USDC-USDT"]
-            collected_pairs = []
-            missing_pairs = []
-            
-            for pair in test_pairs:
-                orderbook = collector.get_orderbook(pair)
-                if orderbook:
-                    collected_pairs.append(pair)
-                else:
-                    missing_pairs.append(pair)
+            # 检查采集的数据：缓存未命中时get_orderbook会阻塞请求REST，放到线程中并发获取
+            orderbooks = await asyncio.gather(
+                *(asyncio.to_thread(collector.get_orderbook, pair) for pair in test_pairs)
+            )
+            collected_pairs = [pair for pair, orderbook in zip(test_pairs, orderbooks) if orderbook]
+            missing_pairs = [pair for pair, orderbook in zip(test_pairs, orderbooks) if not orderbook]
             
             # 停止采集器
             await collector.stop()
             
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('data_collector_test', True, {
                 'duration': f"{test_duration:.2f}s",
                 'requested_pairs': len(test_pairs),
@@ -288,7 +366,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('data_collector_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -306,16 +384,16 @@ class CoreTester:
     async def test_arbitrage_engine(self) -> bool:
         """测试套利计算引擎"""
         print("\n4️⃣ 测试套利计算引擎...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
             # 创建必要组件
-            collector = DataCollector()
+            collector = DataCollector(self._ws_manager)
             engine = ArbitrageEngine(collector)
             
-            # 启动数据采集
+            # 启动数据采集，等待订单簿就绪
             await collector.start()
-            await asyncio.sleep(3)
+            await collector.wait_until_ready(["BTC-USDT", "BTC-USDC", "USDC-USDT"], timeout=10)
             
             # 测试套利机会查找
             test_path = ["USDT", "BTC", "USDC", "USDT"]
@@ -327,7 +405,7 @@ class CoreTester:
             # 停止采集器
             await collector.stop()
             
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             
             opportunities_found = 1 if opportunity and opportunity.profit_rate > 0 else 0
             
@@ -344,7 +422,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('arbitrage_engine_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -362,7 +440,7 @@ class CoreTester:
     async def test_risk_manager(self) -> bool:
         """测试风险管理器"""
         print("\n5️⃣ 测试风险管理器...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
             # 创建风险管理器
@@ -389,7 +467,7 @@ class CoreTester:
             # 测试交易频率检查
             freq_result = risk_manager.check_arbitrage_frequency()
             
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('risk_manager_test', True, {
                 'duration': f"{test_duration:.2f}s",
                 'position_checks': results,
@@ -400,7 +478,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('risk_manager_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -411,11 +489,11 @@ class CoreTester:
     async def test_trade_executor(self) -> bool:
         """测试交易执行器（安全模式）"""
         print("\n6️⃣ 测试交易执行器（安全模式）...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
             # 创建交易执行器
-            client = OKXClient()
+            client = self._get_okx_client()
             executor = TradeExecutor(client)
             
             # 测试余额缓存
@@ -439,7 +517,7 @@ class CoreTester:
                 test_trade['price'] > 0
             )
             
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('trade_executor_test', True, {
                 'duration': f"{test_duration:.2f}s",
                 'balance_cached': balance is not None,
@@ -452,7 +530,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('trade_executor_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -466,32 +544,34 @@ class CoreTester:
             return True
             
         print("\n7️⃣ 测试WebSocket连接...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
-            # 创建WebSocket管理器
-            ws_manager = WebSocketManager()
+            # 复用共用连接，只增加订阅；共用连接不可用时自建连接
+            owns_connection = self._ws_manager is None
+            ws_manager = WebSocketManager() if owns_connection else self._ws_manager
+            if owns_connection and not await ws_manager.connect():
+                raise ConnectionError("WebSocket连接失败")
+            if not ws_manager.is_ws_connected():
+                raise ConnectionError("WebSocket未连接")
             
             # 订阅测试
             test_pairs = ["BTC-USDT", "ETH-USDT"]
             await ws_manager.subscribe_orderbooks(test_pairs)
             
-            # 等待数据
-            await asyncio.sleep(5)
-            
-            # 检查接收的数据
-            received_data = False
-            for pair in test_pairs:
-                orderbook = ws_manager.get_orderbook(pair)
-                if orderbook:
-                    received_data = True
-                    break
+            # 等待数据：任一交易对收到订单簿即返回，最多等待5秒
+            received_data = await wait_until(
+                lambda: any(ws_manager.get_orderbook(pair) for pair in test_pairs),
+                timeout=5
+            )
             
-            # 取消订阅
-            await ws_manager.unsubscribe_all()
-            await ws_manager.close()
+            # 自建的连接在此关闭；共用连接只取消本测试的订阅，连接由teardown关闭
+            if owns_connection:
+                await ws_manager.disconnect()
+            else:
+                await ws_manager.unsubscribe_orderbooks(test_pairs)
             
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('websocket_test', True, {
                 'duration': f"{test_duration:.2f}s",
                 'subscribed_pairs': test_pairs,
@@ -502,7 +582,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('websocket_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -516,7 +596,7 @@ class CoreTester:
             return True
             
         print("\n8️⃣ 系统集成测试...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
             # 创建交易控制器
@@ -525,8 +605,9 @@ class CoreTester:
             # 启动系统
             await controller.start()
             
-            # 运行一段时间
-            await asyncio.sleep(10)
+            # 等待订单簿数据就绪，再留一小段时间让监控循环运行几轮
+            await controller.data_collector.wait_until_ready(controller.trading_pairs, timeout=10)
+            await asyncio.sleep(1)
             
             # 获取统计
             stats = controller.get_stats()
@@ -534,7 +615,7 @@ class CoreTester:
             # 停止系统
             await controller.stop()
             
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('integration_test', True, {
                 'duration': f"{test_duration:.2f}s",
                 'opportunities_found': stats.get('opportunities_found', 0),
@@ -546,7 +627,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('integration_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -560,18 +641,14 @@ class CoreTester:
             return True
             
         print("\n9️⃣ 性能和资源监控测试...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
-            import psutil
-            import os
+            process = self._process
             
-            # 获取进程
-            process = psutil.Process(os.getpid())
-            
-            # 记录初始资源使用
+            # 记录初始资源使用；cpu_percent(None)以本次调用为采样基准，最终读数只覆盖压力测试期间
             initial_memory = process.memory_info().rss / 1024 / 1024  # MB
-            initial_cpu = process.cpu_percent()
+            process.cpu_percent(None)
             
             # 运行压力测试
             collector = DataCollector()
@@ -587,11 +664,11 @@ class CoreTester:
             
             # 记录最终资源使用
             final_memory = process.memory_info().rss / 1024 / 1024  # MB
-            final_cpu = process.cpu_percent()
+            final_cpu = process.cpu_percent(None)
             
             await collector.stop()
             
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             memory_increase = final_memory - initial_memory
             
             self.log_test_result('performance_test', True, {
@@ -608,7 +685,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('performance_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -629,7 +706,7 @@ class CoreTester:
             return True
             
         print("\n🔟 错误处理和恢复测试...")
-        test_start = time.time()
+        test_start = time.perf_counter()
         
         try:
             error_scenarios = []
@@ -671,7 +748,48 @@ class CoreTester:
                     'error': str(e)
                 })
             
-            test_duration = time.time() - test_start
+            # 测试突发请求（限流）处理：10个余额请求同时发出，真正触发交易所的突发限流
+            try:
+                rapid_client = self._get_okx_client()
+                
+                async def _timed_get_balance():
+                    call_start = time.perf_counter_ns()
+                    result = await asyncio.to_thread(rapid_client.get_balance)
+                    return time.perf_counter_ns() - call_start, result
+                
+                results = await asyncio.gather(*(_timed_get_balance() for _ in range(10)),
+                                               return_exceptions=True)
+                # 只记录汇总值，不保存每个请求的明细，避免测试结果和日志随请求数膨胀
+                errors = [r for r in results if isinstance(r, Exception)]
+                timed = [r for r in results if not isinstance(r, Exception)]
+                # 耗时一次转换为numpy数组，统计量向量化计算（纳秒转毫秒）
+                # 样本只有10个，不报告p99（与max无区别），尾部延迟看max
+                durations_ms = np.array([duration_ns for duration_ns, _ in timed], dtype=np.float64) / 1e6
+                latency = {}
+                if durations_ms.size:
+                    latency = {
+                        'min_duration_ms': round(float(durations_ms.min()), 2),
+                        'avg_duration_ms': round(float(durations_ms.mean()), 2),
+                        'p50_duration_ms': round(float(np.median(durations_ms)), 2),
+                        'max_duration_ms': round(float(durations_ms.max()), 2)
+                    }
+                error_scenarios.append({
+                    'scenario': 'rapid_requests',
+                    # 客户端内部处理限流错误，不应有异常抛出到调用方
+                    'handled': not errors,
+                    'requests': len(results),
+                    'succeeded': sum(1 for _, result in timed if result),
+                    **latency,
+                    'first_error': str(errors[0]) if errors else None
+                })
+            except Exception as e:
+                error_scenarios.append({
+                    'scenario': 'rapid_requests',
+                    'handled': False,
+                    'error': str(e)
+                })
+            
+            test_duration = time.perf_counter() - test_start
             all_handled = all(s.get('handled', False) for s in error_scenarios)
             
             self.log_test_result('error_handling_test', all_handled, {
@@ -686,7 +804,7 @@ class CoreTester:
             return True
             
         except Exception as e:
-            test_duration = time.time() - test_start
+            test_duration = time.perf_counter() - test_start
             self.log_test_result('error_handling_test', False, {
                 'error': str(e),
                 'duration': f"{test_duration:.2f}s"
@@ -727,8 +845,7 @@ async def main():
     parser.add_argument('--coverage', action='store_true', help='生成覆盖率报告')
     args = parser.parse_args()
     
-    # 创建日志目录
-    os.makedirs("tests/logs", exist_ok=True)
+    # 创建报告目录（日志目录由setup_logger创建，不可写时回退到仅控制台输出）
     os.makedirs("tests/reports", exist_ok=True)
     
     if args.coverage:
@@ -779,6 +896,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    # 安装了uvloop时使用基于libuv的事件循环，需在asyncio.run之前设置策略
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     try:
         success = asyncio.run(main())
         sys.exit(0 if success else 1)
@@ -1,9 +1,12 @@
 import configparser
+import threading
 
 import pytest
 
 from config.config_manager import ConfigManager
 from core.arbitrage_engine import ArbitrageEngine
+from models.arbitrage_path import ArbitrageAnalysis, ArbitrageOpportunity, ArbitragePath
+from models.order_book import OrderBook
 
 
 class DummyCollector:
@@ -31,6 +34,91 @@ def test_slippage_reduces_profit():
     assert profit_with_slippage < profit_without_slippage
 
 
+def test_max_trade_amount_uses_top_five_levels():
+    engine = ArbitrageEngine(DummyCollector())
+    asks = [[100.0 + i, 1.0] for i in range(6)]
+    book = OrderBook('BTC-USDT', [[99.0, 2.0], [98.0, 0.5]], asks, 1.0)
+    trade_steps = [
+        {'pair': 'BTC-USDT', 'action': 'buy', 'order_book': book},
+        {'pair': 'BTC-USDT', 'action': 'sell', 'order_book': {'bids': [(99.0, 3.0), (98.0, 4.0)], 'asks': []}},
+    ]
+
+    # 买单只计前5档卖单深度（第6档不计入）
+    assert engine._calculate_max_trade_amount_from_steps(trade_steps) == 5.0
+
+    trade_steps[0]['action'] = 'sell'
+    assert engine._calculate_max_trade_amount_from_steps(trade_steps) == 2.5
+
+
+def test_snapshot_fingerprint_tracks_orderbook_updates():
+    collector = DummyCollector()
+    collector.orderbook_cache = {}
+    collector.cache_lock = threading.Lock()
+    engine = ArbitrageEngine(collector)
+    engine.paths = {
+        'path1': {'steps': [{'pair': 'USDC-USDT'}, {'pair': 'BTC-USDC'}, {'pair': 'BTC-USDT'}]}
+    }
+
+    empty = engine.snapshot_fingerprint()
+    assert empty == (('BTC-USDC', None), ('BTC-USDT', None), ('USDC-USDT', None))
+
+    collector.orderbook_cache['BTC-USDT'] = OrderBook('BTC-USDT', [[100.0, 1.0]], [[101.0, 1.0]], 1.0)
+    first = engine.snapshot_fingerprint()
+    assert first != empty
+    assert engine.snapshot_fingerprint() == first
+
+    collector.orderbook_cache['BTC-USDT'] = OrderBook('BTC-USDT', [[100.0, 1.0]], [[101.0, 1.0]], 2.0)
+    assert engine.snapshot_fingerprint() != first
+
+
+def test_find_opportunities_dedupes_ordered_paths_only():
+    book = OrderBook('X', [[1.0, 1.0]], [[1.0, 1.0]], 1.0)
+    collector = DummyCollector()
+    collector.get_arbitrage_orderbook = lambda pair: book
+    engine = ArbitrageEngine(collector)
+    steps = {'steps': [{'pair': 'BTC-USDT'}, {'pair': 'ETH-BTC'}, {'pair': 'ETH-USDT'}]}
+    engine.paths = {'usdt_low': steps, 'usdt_high': steps, 'btc_start': steps}
+
+    results = {
+        'usdt_low': (['USDT', 'BTC', 'ETH', 'USDT'], 0.001),
+        'usdt_high': (['USDT', 'BTC', 'ETH', 'USDT'], 0.002),
+        'btc_start': (['BTC', 'ETH', 'USDT', 'BTC'], 0.0015),
+    }
+    engine.calculate_arbitrage_from_steps = lambda name, config, orderbooks: ArbitrageOpportunity(
+        path=ArbitragePath(path=results[name][0]), profit_rate=results[name][1], min_amount=1.0, timestamp=1.0
+    )
+
+    opportunities = engine.find_opportunities()
+
+    # 同一有序路径只保留利润率更高者；从BTC起步的旋转路径需要不同起始资金，单独保留
+    assert [(o['path_name'], o['profit_rate']) for o in opportunities] == [('usdt_high', 0.002), ('btc_start', 0.0015)]
+    assert opportunities[0]['path'] == ['USDT', 'BTC', 'ETH', 'USDT']
+
+
+
+def test_recent_analysis_columns_stay_aligned_across_threads():
+    engine = ArbitrageEngine(DummyCollector())
+    done = threading.Event()
+
+    def writer():
+        for i in range(5000):
+            engine._record_analysis(ArbitrageAnalysis(f"p{i}", float(i), float(i), False, 100.0, 100.0))
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    # 引擎线程写入的同时读取列快照：各列等长且同一行属于同一条分析结果
+    while not done.is_set():
+        paths, profit_rates, timestamps = engine.get_recent_analysis_columns(15)
+        assert len(paths) == len(profit_rates) == len(timestamps)
+        for path_name, profit_rate, timestamp in zip(paths, profit_rates, timestamps):
+            assert path_name == f"p{int(profit_rate)}" and timestamp == profit_rate
+    thread.join()
+
+    paths, _, _ = engine.get_recent_analysis_columns(15)
+    assert paths[0] == 'p4999' and len(engine.recent_analyses) == 200
+
+
 def test_unknown_key_fails_fast():
     config_manager = ConfigManager()
     original_config = config_manager.config
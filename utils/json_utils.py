@@ -0,0 +1,66 @@
+"""
+JSON序列化工具
+
+可选使用 orjson（C实现，直接产出UTF-8字节，比标准库 json 快数倍），未安装时回退到 json。
+两种实现解析失败时都抛出 json.JSONDecodeError（orjson 的异常是其子类）。
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    loads = orjson.loads
+
+    def dumps_bytes(obj, indent: bool = False, default=None) -> bytes:
+        """
+        序列化为UTF-8字节
+
+        Args:
+            obj: 待序列化对象
+            indent: 是否按2空格缩进输出（默认紧凑格式）
+            default: 无法序列化的对象的转换函数，如str
+
+        Returns:
+            JSON字节串
+        """
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if indent else 0)
+else:
+    loads = json.loads
+
+    def dumps_bytes(obj, indent: bool = False, default=None) -> bytes:
+        """
+        序列化为UTF-8字节
+
+        Args:
+            obj: 待序列化对象
+            indent: 是否按2空格缩进输出（默认紧凑格式）
+            default: 无法序列化的对象的转换函数，如str
+
+        Returns:
+            JSON字节串
+        """
+        if indent:
+            text = json.dumps(obj, indent=2, ensure_ascii=False, default=default)
+        else:
+            text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=default)
+        return text.encode('utf-8')
+
+
+def dumps(obj, indent: bool = False, default=None) -> str:
+    """
+    序列化为字符串（如WebSocket文本帧、日志内容）
+
+    Args:
+        obj: 待序列化对象
+        indent: 是否按2空格缩进输出（默认紧凑格式）
+        default: 无法序列化的对象的转换函数，如str
+
+    Returns:
+        JSON字符串
+    """
+    return dumps_bytes(obj, indent=indent, default=default).decode('utf-8')
@@ -1,10 +1,49 @@
+import atexit
+import copy
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from rich.logging import RichHandler
 from rich.console import Console
 
 
+class _LocalQueueHandler(QueueHandler):
+    """
+    进程内队列处理器：消息在入队时格式化，但保留exc_info，
+    由后台线程的RichHandler渲染富文本traceback（标准QueueHandler会把异常转成纯文本）
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+class _DispatchHandler(logging.Handler):
+    """后台线程中把记录转交给其所属logger的实际处理器"""
+    
+    def handle(self, record):
+        for handler in _logger_handlers.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+
+# 所有logger共用一个队列和一个后台写日志线程（首次setup_logger时启动）
+_log_queue = queue.SimpleQueue()
+_listener = None
+_listener_lock = threading.Lock()
+# logger名称 -> 实际输出的处理器（控制台/文件），由后台线程调用
+_logger_handlers = {}
+# shutdown_logging() 之后新建的logger直接挂实际处理器
+_logging_shut_down = False
+
+
 def setup_logger(name, log_file=None, level=logging.INFO):
     """
     设置日志记录器
@@ -17,6 +56,8 @@ def setup_logger(name, log_file=None, level=logging.INFO):
     Returns:
         配置好的logger实例
     """
+    global _listener
+    
     # 创建logger实例
     logger = logging.getLogger(name)
     
@@ -30,6 +71,9 @@ def setup_logger(name, log_file=None, level=logging.INFO):
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     formatter = logging.Formatter(log_format, datefmt="%Y-%m-%d %H:%M:%S")
     
+    # 实际输出的处理器交给后台线程执行，logger 本身只做入队，不在调用线程上写控制台/文件
+    handlers = []
+    
     # 控制台处理器（使用Rich美化）
     console = Console()
     console_handler = RichHandler(
@@ -40,26 +84,70 @@ def setup_logger(name, log_file=None, level=logging.INFO):
         rich_tracebacks=True
     )
     console_handler.setLevel(level)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
-    # 文件处理器
+    # 文件处理器（日志目录不可写时只输出到控制台，不中断程序）
+    file_error = None
     if log_file:
-        # 确保日志目录存在
-        log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir, exist_ok=True)
-        
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        try:
+            # 确保日志目录存在
+            log_dir = os.path.dirname(log_file)
+            if log_dir and not os.path.exists(log_dir):
+                os.makedirs(log_dir, exist_ok=True)
+            
+            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler.setLevel(level)
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        except OSError as e:
+            file_error = e
+    
+    with _listener_lock:
+        if _logging_shut_down:
+            # 后台线程已停止：同步输出，保证退出阶段的日志不丢失
+            for handler in handlers:
+                logger.addHandler(handler)
+        else:
+            _logger_handlers[name] = handlers
+            if _listener is None:
+                _listener = QueueListener(_log_queue, _DispatchHandler())
+                _listener.start()
+            logger.addHandler(_LocalQueueHandler(_log_queue))
     
     # 防止日志向上传播到根logger
     logger.propagate = False
     
+    if file_error is not None:
+        logger.warning(f"无法写入日志文件 {log_file}，仅输出到控制台: {file_error}")
+    
     return logger
 
 
+def shutdown_logging():
+    """
+    停止后台写日志线程（先写完队列中剩余的日志），并把各logger的实际处理器换回，
+    之后的日志（如其他atexit钩子中的日志）同步输出而不是进入无人读取的队列；可重复调用
+    """
+    global _listener, _logging_shut_down
+    with _listener_lock:
+        _logging_shut_down = True
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        
+        for name, handlers in _logger_handlers.items():
+            logger = logging.getLogger(name)
+            for handler in list(logger.handlers):
+                if isinstance(handler, _LocalQueueHandler):
+                    logger.removeHandler(handler)
+            for handler in handlers:
+                logger.addHandler(handler)
+        _logger_handlers.clear()
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name):
     """
     获取已配置的logger实例